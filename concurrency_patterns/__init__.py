@@ -0,0 +1,69 @@
+"""
+Concurrency patterns: bounded buffers, reader-writer locks, crawlers, schedulers, allocators,
+connection pools, a work stealing executor and the classic synchronization problems.
+
+Importing the package (or any submodule) has no side effects; every demo runs only as a script,
+e.g. python -m concurrency_patterns.rw_lock. Benchmarks: python -m concurrency_patterns.benchmarks.
+
+Submodules are loaded lazily: `from concurrency_patterns import RWLock` imports only rw_lock
+(and what it imports), so optional dependencies (numpy, sortedcontainers) are only needed by
+the classes using them.
+"""
+import importlib
+
+_EXPORTS = {
+    "barber_pool": ["BarberPool", "Customer", "Histogram", "ShedPolicy"],
+    "big_reader_lock": ["BigReaderLock"],
+    "buddy_memory_allocator": ["BuddyMemoryAllocator"],
+    "cached_html_parser": ["CachingHtmlParser", "CoalescedFetchError", "SqliteUrlStore"],
+    "cigarette_smokers_problem": ["SmokingTable"],
+    "circular_bounded_buffer": ["CircularBoundedBuffer"],
+    "connection_pool": ["ConnectionPool", "FakeBackend", "FakeConnection"],
+    "dining_philospher": ["ChandyMisraTable", "ForkOrderingTable", "Philospher", "WaiterTable"],
+    "discrete_event_sim": ["SimBarrier", "SimEvent", "SimResource", "Simulation"],
+    "early_stop_multiphase_simulation": ["EarlyStopSimulation"],
+    "job_scheduler": ["JobScheduler"],
+    "lock_profiler": ["LockProfiler", "new_condition", "new_lock", "new_semaphore"],
+    "memory_allocator": ["MemoryAllocator"],
+    "multi_lock_manager": ["ManagedLock", "MultiLockManager"],
+    "multithreaded_webcrawler_v2": [
+        "BloomFilter", "HashedUrlSet", "HtmlParser", "ScalableBloomFilter", "UrlSet", "WebCrawler", "crawl",
+    ],
+    "numpy_phase_engine": ["ChunkedArrayEngine"],
+    "phase_engine": ["PhaseEngine", "PhaseError"],
+    "polite_webcrawler": ["PerHostFrontier", "PoliteWebCrawler", "TokenBucket", "polite_crawl"],
+    "producer_consumer_bounded_buffer": ["BoundedBuffer"],
+    "rcu_snapshot": ["RCUSnapshot"],
+    "reader_writer_problem": ["ReaderWriterLock"],
+    "reader_writer_v2": ["WritePriorityReaderWriterLock"],
+    "resource_dispatcher": ["ResourceDispatcher"],
+    "rw_lock": ["RWLock", "RWLockPolicy"],
+    "seqlock": ["SeqLockValue"],
+    "sharded_webcrawler": ["sharded_crawl"],
+    "single_queue_with_fixed_size_buffer": ["Queue"],
+    "sleeping_barber": ["SleepingBarber"],
+    "spilling_frontier": ["SpillingFrontier"],
+    "work_stealing_executor": ["WorkStealingExecutor"],
+}
+
+# Submodules without package level exports, still reachable as concurrency_patterns.<name>.
+_SUBMODULES = {"benchmarks", "dining_philospher_benchmark", "multithreaded_webcrawler", "rw_lock_benchmark"}
+
+_NAME_TO_MODULE = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_NAME_TO_MODULE)
+
+
+def __getattr__(name):
+    if name in _EXPORTS or name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    module = _NAME_TO_MODULE.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # cache, next lookup doesn't go through __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,269 @@
+"""
+Problem Statement:
+    - SleepingBarber (sleeping_barber.py) is our model of a bounded queue service, but it has
+      one process_customers loop and handle_customer can only reject when the room is full.
+    - Generalize to:
+        - Pool of C barbers (workers) sharing one bounded waiting area.
+        - Pluggable shedding policy when waiting area is full:
+            - REJECT_NEW: turn away arriving customer (SleepingBarber behaviour).
+            - DROP_OLDEST: drop longest waiting customer, admit the new one (it is the one most
+              likely to have given up already).
+            - DEADLINE_AWARE: customers carry a deadline. Drop waiting customers which can no
+              longer make it, and reject an arriving customer whose deadline can't be met.
+        - Queue wait, service time and rejection rate as histograms, to size worker counts and
+          queue limits.
+
+Approach:
+    - Same structure as SleepingBarber: one lock, customer_available Condition, barbers sleep
+      while waiting area is empty. waiting is a deque (FIFO).
+    - submit(customer) -> bool (admitted):
+        - Decision is admit() (module level, no locking, no threads), shared with
+          discrete_event_sim.simulate_barber_pool so simulated sweeps run the same policies.
+        - Room free: append, notify one barber.
+        - Full: apply policy. Shed customers get outcome set and their done event set, so a
+          caller waiting on the customer never hangs.
+    - Deadline aware:
+        - Estimated wait of a new customer = (waiting + busy barbers) / C * avg service time
+          (EWMA of measured service times).
+        - On arrival, waiting customers past their deadline are purged first. Arriving
+          customer is rejected if it would start after its deadline (now + estimated wait) or
+          if room is still full.
+        - Barber also skips customers already expired when it picks them (outcome "expired").
+    - Metrics (updated under the pool lock, histograms are tiny):
+        - Histogram: fixed bucket bounds in ms, count per bucket, approximate percentiles.
+        - queue_wait, service_time histograms, counters per outcome, rejection rate.
+    - serve() raising: customer finishes with outcome "failed" (exception kept in
+      customer.error, counted in failure_rate, not in service time / EWMA) and the barber
+      goes on with the next customer, so failures never shrink the pool.
+    - shutdown(): barbers finish customers already waiting, then exit.
+"""
+import bisect
+import random
+import threading
+import time
+from collections import deque
+from enum import Enum
+
+
+class ShedPolicy(Enum):
+    REJECT_NEW = 1
+    DROP_OLDEST = 2
+    DEADLINE_AWARE = 3
+
+
+class Histogram:
+    BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(self.BOUNDS_MS, seconds * 1e3)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, pct):
+        """
+        Upper bound (ms) of bucket holding the pct-th percentile, max for the last bucket.
+        """
+        if not self.count:
+            return 0.0
+        rank = self.count * pct / 100
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.BOUNDS_MS[i] if i < len(self.BOUNDS_MS) else round(self.max * 1e3, 3)
+        return round(self.max * 1e3, 3)
+
+    def to_dict(self):
+        labels = [f"<={bound}ms" for bound in self.BOUNDS_MS] + [f">{self.BOUNDS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1e3, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max * 1e3, 3),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+class Customer:
+    def __init__(self, service_time, deadline=None):
+        self.service_time = service_time
+        self.deadline = deadline  # time.monotonic() by which service must start
+        self.arrived_at = None
+        self.started_at = None
+        self.outcome = None  # served / rejected / dropped / expired / failed
+        self.error = None  # exception raised by serve(), outcome "failed"
+        self.done = threading.Event()
+
+
+def admit(waiting, customer, now, policy, waiting_chairs, estimated_wait):
+    """
+    Admission / shedding decision for customer arriving at now. waiting (deque, oldest first)
+    is updated in place, estimated_wait() is called after expired customers are purged.
+    Returns (admitted, shed): shed is a list of (customer, outcome) to finish.
+    """
+    shed = []
+    if policy is ShedPolicy.DEADLINE_AWARE:
+        alive = []
+        for waiting_customer in waiting:
+            if expired(waiting_customer, now, policy):
+                shed.append((waiting_customer, "expired"))
+            else:
+                alive.append(waiting_customer)
+        if shed:
+            waiting.clear()
+            waiting.extend(alive)
+
+        if customer.deadline is not None and now + estimated_wait() > customer.deadline:
+            shed.append((customer, "rejected"))
+            return False, shed
+
+    if len(waiting) >= waiting_chairs:
+        if policy is ShedPolicy.DROP_OLDEST and waiting:
+            shed.append((waiting.popleft(), "dropped"))
+        else:
+            shed.append((customer, "rejected"))
+            return False, shed
+
+    waiting.append(customer)
+    return True, shed
+
+
+def expired(customer, now, policy):
+    """
+    Deadline aware barber skips a customer whose deadline passed while waiting.
+    """
+    return policy is ShedPolicy.DEADLINE_AWARE and customer.deadline is not None and customer.deadline < now
+
+
+class BarberPool:
+    def __init__(self, num_barbers, waiting_chairs, policy=ShedPolicy.REJECT_NEW, serve=None, ewma_alpha=0.2):
+        self.num_barbers = num_barbers
+        self.waiting_chairs = waiting_chairs
+        self.policy = policy
+        self.serve = serve or (lambda customer: time.sleep(customer.service_time))
+        self.ewma_alpha = ewma_alpha
+
+        self.lock = threading.Lock()
+        self.customer_available = threading.Condition(self.lock)
+        self.waiting = deque()
+        self.busy_barbers = 0
+        self.avg_service_time = 0.0
+        self.is_shutdown = False
+
+        self.queue_wait = Histogram()
+        self.service_time = Histogram()
+        self.outcomes = {"served": 0, "rejected": 0, "dropped": 0, "expired": 0, "failed": 0}
+        self.arrived = 0
+
+        self.barbers = [threading.Thread(target=self.process_customers, daemon=True) for _ in range(num_barbers)]
+        for barber in self.barbers:
+            barber.start()
+
+    def _finish(self, customer, outcome):
+        # Called with self.lock held.
+        customer.outcome = outcome
+        self.outcomes[outcome] += 1
+        customer.done.set()
+
+    def _estimated_wait(self):
+        return (len(self.waiting) + self.busy_barbers) / self.num_barbers * self.avg_service_time
+
+    def submit(self, customer):
+        with self.customer_available:
+            if self.is_shutdown:
+                raise RuntimeError("BarberPool is shut down")
+            now = time.monotonic()
+            customer.arrived_at = now
+            self.arrived += 1
+
+            admitted, shed = admit(self.waiting, customer, now, self.policy, self.waiting_chairs, self._estimated_wait)
+            for shed_customer, outcome in shed:
+                self._finish(shed_customer, outcome)
+            if admitted:
+                self.customer_available.notify()
+            return admitted
+
+    def process_customers(self):
+        while True:
+            with self.customer_available:
+                while not self.waiting and not self.is_shutdown:
+                    self.customer_available.wait()
+                if not self.waiting:
+                    return
+
+                customer = self.waiting.popleft()
+                now = time.monotonic()
+                if expired(customer, now, self.policy):
+                    self._finish(customer, "expired")
+                    continue
+                customer.started_at = now
+                self.queue_wait.record(now - customer.arrived_at)
+                self.busy_barbers += 1
+
+            start = time.monotonic()
+            try:
+                self.serve(customer)
+            except Exception as e:
+                customer.error = e
+                with self.customer_available:
+                    self.busy_barbers -= 1
+                    self._finish(customer, "failed")
+                continue
+
+            elapsed = time.monotonic() - start
+            with self.customer_available:
+                self.busy_barbers -= 1
+                self.service_time.record(elapsed)
+                self.avg_service_time += self.ewma_alpha * (elapsed - self.avg_service_time)
+                self._finish(customer, "served")
+
+    def shutdown(self, wait=True):
+        with self.customer_available:
+            self.is_shutdown = True
+            self.customer_available.notify_all()
+        if wait:
+            for barber in self.barbers:
+                barber.join()
+
+    def stats(self):
+        with self.lock:
+            shed = self.outcomes["rejected"] + self.outcomes["dropped"] + self.outcomes["expired"]
+            return {
+                "arrived": self.arrived,
+                **self.outcomes,
+                "rejection_rate": round(shed / self.arrived, 4) if self.arrived else 0.0,
+                "failure_rate": round(self.outcomes["failed"] / self.arrived, 4) if self.arrived else 0.0,
+                "queue_wait": self.queue_wait.to_dict(),
+                "service_time": self.service_time.to_dict(),
+            }
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    # Overload: 4 barbers, ~10ms service each (capacity ~400/s), Poisson arrivals at 600/s,
+    # every customer must be served within 50ms, 32 chairs (a full room is ~80ms of wait).
+    for policy in ShedPolicy:
+        pool = BarberPool(num_barbers=4, waiting_chairs=32, policy=policy)
+        rng = random.Random(42)
+        customers = []
+        end = time.monotonic() + 1.0
+        while time.monotonic() < end:
+            customer = Customer(service_time=rng.uniform(0.005, 0.015), deadline=time.monotonic() + 0.05)
+            pool.submit(customer)
+            customers.append(customer)
+            time.sleep(rng.expovariate(600))
+        pool.shutdown()
+
+        stats = pool.stats()
+        late = sum(1 for c in customers if c.outcome == "served" and c.started_at > c.deadline)
+        print(f"{policy.name}: served {stats['served']}/{stats['arrived']}, rejection rate {stats['rejection_rate']}, "
+              f"queue wait p50/p99 {stats['queue_wait']['p50_ms']}/{stats['queue_wait']['p99_ms']}ms, "
+              f"service p99 {stats['service_time']['p99_ms']}ms, served after deadline: {late}")
@@ -0,0 +1,491 @@
+"""
+Problem Statement:
+    - No common way to measure the components, or to notice a change made one of them slower.
+    - Repeatable throughput / latency benchmarks for every component group:
+        - buffers, queues, allocators, locks, pools (FakeBackend), executors, scheduler,
+          crawler (local fake HtmlParser, no network)
+    - Save results and compare a later run against that saved baseline.
+
+Approach:
+    - @benchmark(group) registers bench(rng) -> Measurement(ops, elapsed, latencies).
+        - Every bench gets its own random.Random(seed) and a fixed op count, so every run
+          does the same work (thread interleaving still varies).
+        - latencies: per operation seconds, for p50 / p99.
+    - run(names, repeat): every bench runs repeat times, ops/sec is the median run, p50 / p99
+      over latencies of all runs.
+    - Components printing progress (BoundedBuffer, WebCrawler.set_start_url) run with stdout
+      sent to os.devnull, so the numbers include the print cost but not the terminal.
+    - CircularBoundedBuffer.produce sleeps 0.5-1s per item by design (demo), so it is not
+      benchmarked; MemoryAllocator needs sortedcontainers and is skipped without it.
+    - compare(results, baseline, tolerance):
+        - ops/sec lower than baseline by more than tolerance --> regression (exit code 1).
+        - p99 change is reported, but not failed on (thread scheduling makes it noisy).
+
+Usage:
+    python -m concurrency_patterns.benchmarks --save baseline.json
+    python -m concurrency_patterns.benchmarks --baseline baseline.json --tolerance 0.15
+    python -m concurrency_patterns.benchmarks --groups locks crawler --repeat 5
+"""
+import argparse
+import contextlib
+import functools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from .rw_lock_benchmark import percentile
+
+BENCHMARKS = {}
+
+
+class Measurement:
+    def __init__(self, ops, elapsed, latencies):
+        self.ops = ops
+        self.elapsed = elapsed
+        self.latencies = latencies
+
+
+class SkipBenchmark(Exception):
+    pass
+
+
+def benchmark(group):
+    def register(fn):
+        BENCHMARKS[fn.__name__] = (group, fn)
+        return fn
+    return register
+
+
+@contextlib.contextmanager
+def quiet():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def timed_loop(operations):
+    """
+    Runs callables one by one, returns Measurement with per operation latency.
+    """
+    latencies = []
+    start = time.perf_counter()
+    for operation in operations:
+        op_start = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - op_start)
+    return Measurement(len(latencies), time.perf_counter() - start, latencies)
+
+
+###### BUFFERS #########
+
+@benchmark("buffers")
+def bounded_buffer(rng, producers=2, consumers=2, items=5000):
+    from .producer_consumer_bounded_buffer import BoundedBuffer
+
+    buffer = BoundedBuffer(max_capacity=64)
+    latencies = []
+
+    def produce(producer_id):
+        local = []
+        for i in range(items):
+            start = time.perf_counter()
+            buffer.produce(i, producer_id)
+            local.append(time.perf_counter() - start)
+        latencies.extend(local)
+
+    def consume(consumer_id):
+        for _ in range(items * producers // consumers):
+            buffer.consume(consumer_id)
+
+    threads = ([threading.Thread(target=produce, args=(i,)) for i in range(producers)] +
+               [threading.Thread(target=consume, args=(i,)) for i in range(consumers)])
+    with quiet():
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    return Measurement(producers * items, elapsed, latencies)
+
+
+###### QUEUES #########
+
+@benchmark("queues")
+def fixed_size_queue(rng, ops=200_000):
+    from .single_queue_with_fixed_size_buffer import Queue
+
+    queue = Queue(1024)
+    operations = []
+    size = 0
+    for _ in range(ops):
+        if size == 0 or (size < queue.size and rng.random() < 0.5):
+            operations.append(functools.partial(queue.enqueue, 1))
+            size += 1
+        else:
+            operations.append(queue.deque)
+            size -= 1
+    return timed_loop(operations)
+
+
+@benchmark("queues")
+def spilling_frontier(rng, urls=50_000):
+    from .spilling_frontier import SpillingFrontier
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        with SpillingFrontier(segment_size=4096, spill_dir=spill_dir) as frontier:
+            batch = [f"http://site.com/{rng.randrange(10**9)}" for _ in range(urls)]
+            operations = [lambda url=url: frontier.append(url) for url in batch] + [frontier.pop] * urls
+            return timed_loop(operations)
+
+
+@benchmark("queues")
+def per_host_frontier(rng, urls=50_000, hosts=500):
+    from .polite_webcrawler import PerHostFrontier
+
+    frontier = PerHostFrontier(default_rate=1e9, burst=10**6)
+    batch = [f"http://host{rng.randrange(hosts)}.com/{i}" for i in range(urls)]
+    return timed_loop([lambda url=url: frontier.append(url) for url in batch] + [frontier.pop_ready] * urls)
+
+
+###### ALLOCATORS #########
+
+def allocator_operations(rng, allocator, ops, max_size):
+    live = []
+    operations = []
+
+    def allocate(size):
+        try:
+            ptr = allocator.allocate(size)
+        except ValueError:
+            return
+        if ptr != -1:
+            live.append(ptr)
+
+    def step(size):
+        # Decided at run time, depends on what is live. Same seed --> same sequence.
+        if not live or rng.random() < 0.55:
+            allocate(size)
+        else:
+            allocator.free(live.pop(rng.randrange(len(live))))
+
+    for _ in range(ops):
+        operations.append(functools.partial(step, rng.randint(1, max_size)))
+    return operations
+
+
+@benchmark("allocators")
+def buddy_allocator(rng, ops=50_000):
+    from .buddy_memory_allocator import BuddyMemoryAllocator
+
+    allocator = BuddyMemoryAllocator(1 << 16)
+    return timed_loop(allocator_operations(rng, allocator, ops, 256))
+
+
+@benchmark("allocators")
+def first_fit_allocator(rng, ops=20_000):
+    try:
+        from .memory_allocator import MemoryAllocator
+    except ImportError as e:
+        raise SkipBenchmark(f"needs sortedcontainers ({e})")
+
+    allocator = MemoryAllocator(1 << 16)
+    with quiet():
+        return timed_loop(allocator_operations(rng, allocator, ops, 256))
+
+
+###### LOCKS #########
+
+def rw_lock_case(lock_name, rng, threads=4, ops=5000, read_pct=90):
+    from .rw_lock_benchmark import LOCKS
+
+    lock = LOCKS[lock_name]()
+    plans = [[rng.random() * 100 < read_pct for _ in range(ops)] for _ in range(threads)]
+    latencies = []
+    go = threading.Event()
+
+    def worker(plan):
+        local = []
+        go.wait()
+        for is_read in plan:
+            start = time.perf_counter()
+            if is_read:
+                lock.acquire_read()
+                lock.release_read()
+            else:
+                lock.acquire_write()
+                lock.release_write()
+            local.append(time.perf_counter() - start)
+        latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(plan,)) for plan in plans]
+    for t in workers:
+        t.start()
+    start = time.perf_counter()
+    go.set()
+    for t in workers:
+        t.join()
+    return Measurement(threads * ops, time.perf_counter() - start, latencies)
+
+
+@benchmark("locks")
+def rw_lock_phase_fair(rng):
+    return rw_lock_case("RWLock[phase_fair]", rng)
+
+
+@benchmark("locks")
+def rw_lock_writer_preferring(rng):
+    return rw_lock_case("RWLock[writer]", rng)
+
+
+@benchmark("locks")
+def big_reader_lock(rng):
+    return rw_lock_case("BigReaderLock", rng)
+
+
+@benchmark("locks")
+def multi_lock_transfers(rng, shards=16, threads=4, transfers=5000):
+    from .multi_lock_manager import MultiLockManager
+
+    manager = MultiLockManager()
+    locks = [manager.new_lock(f"shard-{i}") for i in range(shards)]
+    balances = [0] * shards
+    pairs = [rng.sample(range(shards), 2) for _ in range(threads * transfers)]
+    latencies = []
+
+    def worker(worker_pairs):
+        local = []
+        for src, dst in worker_pairs:
+            start = time.perf_counter()
+            with manager.locked(locks[src], locks[dst]):
+                balances[src] -= 1
+                balances[dst] += 1
+            local.append(time.perf_counter() - start)
+        latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(pairs[i::threads],)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return Measurement(len(pairs), time.perf_counter() - start, latencies)
+
+
+###### POOLS #########
+
+@benchmark("pools")
+def connection_pool(rng, threads=8, max_size=4, requests=2000):
+    from .connection_pool import ConnectionPool, FakeBackend, FakeConnection
+
+    # Zero latency backend: measures acquire / health check / release under contention only.
+    backend = FakeBackend(connect_latency=0.0, query_latency=0.0)
+    pool = ConnectionPool(backend.connect, max_size=max_size, health_check=FakeConnection.ping)
+    latencies = []
+
+    def worker():
+        local = []
+        for i in range(requests):
+            start = time.perf_counter()
+            with pool.connection() as connection:
+                connection.execute(i)
+            local.append(time.perf_counter() - start)
+        latencies.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    pool.close()
+    return Measurement(threads * requests, elapsed, latencies)
+
+
+###### EXECUTORS #########
+
+def fan_out_case(executor_cls, workers=4, depth=5, branching=6):
+    from .work_stealing_executor import fan_out
+
+    # Latency: submit -> start of each of the 9331 tasks.
+    with executor_cls(workers) as executor:
+        start = time.perf_counter()
+        delays = fan_out(executor, depth, branching, work=100)
+        elapsed = time.perf_counter() - start
+    return Measurement(len(delays), elapsed, delays)
+
+
+@benchmark("executors")
+def work_stealing_fan_out(rng):
+    from .work_stealing_executor import WorkStealingExecutor
+
+    return fan_out_case(WorkStealingExecutor)
+
+
+@benchmark("executors")
+def thread_pool_fan_out(rng):
+    from concurrent.futures import ThreadPoolExecutor
+
+    return fan_out_case(ThreadPoolExecutor)
+
+
+###### SCHEDULER #########
+
+@benchmark("scheduler")
+def job_scheduler(rng, layers=10, width=30):
+    from .job_scheduler import JobScheduler
+
+    scheduler = JobScheduler()
+    for layer in range(layers):
+        for i in range(width):
+            deps = rng.sample(range(width), 3) if layer else []
+            scheduler.add_job(f"job-{layer}-{i}", [f"job-{layer - 1}-{d}" for d in deps])
+
+    # Drive scheduling decisions only (run_job sleeps 0.5s per job): ask for ready jobs, finish
+    # them, repeat until everything ran.
+    latencies = []
+    start = time.perf_counter()
+    while len(scheduler.finished_jobs) < len(scheduler.jobs):
+        op_start = time.perf_counter()
+        ready = scheduler.get_next_jobs_to_run()
+        for job in ready:
+            scheduler.mark_job_finished(job)
+        latencies.append(time.perf_counter() - op_start)
+    return Measurement(len(scheduler.jobs), time.perf_counter() - start, latencies)
+
+
+###### CRAWLER #########
+
+def fake_site(rng, pages=3000, links=8):
+    return {
+        f"http://site.com/{i}": [f"http://site.com/{rng.randrange(pages)}" for _ in range(links)]
+        for i in range(pages)
+    }
+
+
+class TimedParser:
+    def __init__(self, parser):
+        self.parser = parser
+        self.latencies = []
+
+    def getUrls(self, url):
+        start = time.perf_counter()
+        try:
+            return self.parser.getUrls(url)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+@benchmark("crawler")
+def crawler(rng, threads=4):
+    from .multithreaded_webcrawler_v2 import HtmlParser, crawl
+
+    parser = TimedParser(HtmlParser(fake_site(rng)))
+    with quiet():
+        start = time.perf_counter()
+        pages = len(crawl("http://site.com/0", parser, num_threads=threads))
+        elapsed = time.perf_counter() - start
+    return Measurement(pages, elapsed, parser.latencies)
+
+
+@benchmark("crawler")
+def caching_crawler(rng, threads=4):
+    from .cached_html_parser import CachingHtmlParser
+    from .multithreaded_webcrawler_v2 import HtmlParser, crawl
+
+    cache = CachingHtmlParser(HtmlParser(fake_site(rng)), max_entries=10_000)
+    with quiet():
+        crawl("http://site.com/0", cache, num_threads=threads)  # warm the cache
+        parser = TimedParser(cache)
+        start = time.perf_counter()
+        pages = len(crawl("http://site.com/0", parser, num_threads=threads))
+        elapsed = time.perf_counter() - start
+    return Measurement(pages, elapsed, parser.latencies)
+
+
+###### RUNNER #########
+
+def run(names, repeat=3, seed=0):
+    results = {}
+    for name in names:
+        group, fn = BENCHMARKS[name]
+        runs = []
+        try:
+            for _ in range(repeat):
+                runs.append(fn(random.Random(seed)))
+        except SkipBenchmark as e:
+            print(f"{name:<28} skipped: {e}")
+            continue
+
+        latencies = [latency for measurement in runs for latency in measurement.latencies]
+        result = {
+            "group": group,
+            "ops": runs[0].ops,
+            "ops_per_sec": round(statistics.median(m.ops / m.elapsed for m in runs), 1),
+            "p50_us": round(percentile(latencies, 50) * 1e6, 2),
+            "p99_us": round(percentile(latencies, 99) * 1e6, 2),
+        }
+        results[name] = result
+        print(f"{name:<28} {group:<11} ops/s={result['ops_per_sec']:>12}  "
+              f"p50={result['p50_us']:>10}us  p99={result['p99_us']:>10}us")
+    return results
+
+
+def compare(results, baseline, tolerance=0.1):
+    """
+    Returns names of benchmarks whose ops/sec dropped more than tolerance below baseline.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<28} {'baseline ops/s':>15} {'ops/s':>12} {'change':>8} {'p99 change':>11}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<28} {'(new)':>15} {result['ops_per_sec']:>12}")
+            continue
+        change = result["ops_per_sec"] / base["ops_per_sec"] - 1 if base["ops_per_sec"] else 0.0
+        p99_change = result["p99_us"] / base["p99_us"] - 1 if base["p99_us"] else 0.0
+        regressed = change < -tolerance
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<28} {base['ops_per_sec']:>15} {result['ops_per_sec']:>12} {change:>+8.1%} "
+              f"{p99_change:>+11.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main(argv=None):
+    groups = sorted({group for group, _ in BENCHMARKS.values()})
+    parser = argparse.ArgumentParser(description="Benchmark runner for concurrency_patterns components")
+    parser.add_argument("--groups", nargs="+", choices=groups, default=groups)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run these benchmarks only")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write results to this JSON file (e.g. a new baseline)")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed ops/sec drop, 0.1 = 10%%")
+    args = parser.parse_args(argv)
+
+    names = args.only or [name for name, (group, _) in BENCHMARKS.items() if group in args.groups]
+    results = run(names, args.repeat, args.seed)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
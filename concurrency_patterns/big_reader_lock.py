@@ -0,0 +1,173 @@
+"""
+Problem Statement:
+    - Every reader in ReaderWriterLock / WritePriorityReaderWriterLock (and RWLock in
+      rw_lock.py) takes one shared lock just to update reader_count. With many reader threads
+      that single mutex serializes readers which should run in parallel.
+    - Add a "big-reader" lock: readers only touch a counter slot of their own thread/stripe,
+      writers drain all slots.
+
+Approach:
+    - stripes: list of ReaderStripe(lock + condition + readers count + writer_active flag).
+    - Each thread is assigned one stripe round robin on first use (threading.local), so with
+      num_stripes >= number of reader threads no two readers share a lock.
+
+    - Reader:
+        - with own stripe: wait while stripe.writer_active, then stripe.readers += 1.
+        - release: stripe.readers -= 1, wake writer if stripe drained.
+    - Writer:
+        - writer_lock: one writer at a time (writer_owner recorded, like RWLock).
+        - For each stripe, under its lock: stripe.writer_active = True, then wait until
+          readers == 0. Flag and counter of a stripe are only touched under that stripe's lock,
+          so a reader either incremented before the flag was set (writer waits for it) or sees
+          the flag and waits. Once a stripe is drained it stays drained.
+        - release: for each stripe, under its lock: writer_active = False and notify.
+
+    - Cost: reads are O(1) on an uncontended lock, writes are O(num_stripes). Good trade for
+      read-mostly data; writer preferring by construction.
+    - Reads are not reentrant, and a read lock must be released by the thread that acquired it
+      (stripe is looked up per thread).
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from .lock_profiler import new_condition, new_lock
+from .rw_lock import RWLock
+
+
+class ReaderStripe:
+    def __init__(self, profiler=None):
+        self.lock = new_lock("BigReaderLock.stripe.lock", profiler)
+        self.drained = new_condition(self.lock, "BigReaderLock.stripe.drained", profiler)
+        self.readers = 0
+        self.writer_active = False
+
+
+class BigReaderLock:
+    def __init__(self, num_stripes=None, profiler=None):
+        # profiler: optional LockProfiler (lock_profiler.py), all stripes report as one name.
+        self.num_stripes = num_stripes or (os.cpu_count() or 1) * 4
+        self.stripes = [ReaderStripe(profiler) for _ in range(self.num_stripes)]
+        self.writer_lock = new_lock("BigReaderLock.writer_lock", profiler)
+        self.writer_owner = None
+
+        self.local = threading.local()
+        self.assign_lock = threading.Lock()
+        self.next_stripe = 0
+
+    def _stripe(self):
+        stripe = getattr(self.local, "stripe", None)
+        if stripe is None:
+            with self.assign_lock:
+                stripe = self.stripes[self.next_stripe]
+                self.next_stripe = (self.next_stripe + 1) % self.num_stripes
+            self.local.stripe = stripe
+        return stripe
+
+    def acquire_read(self, timeout=None):
+        stripe = self._stripe()
+        with stripe.drained:
+            if stripe.writer_active and not stripe.drained.wait_for(lambda: not stripe.writer_active, timeout):
+                return False
+            stripe.readers += 1
+            return True
+
+    def release_read(self):
+        stripe = self._stripe()
+        with stripe.drained:
+            if stripe.readers == 0:
+                raise RuntimeError("release_read() called without a matching acquire_read()")
+            stripe.readers -= 1
+            if stripe.readers == 0 and stripe.writer_active:
+                stripe.drained.notify_all()
+
+    def acquire_write(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self.writer_lock.acquire(timeout=-1 if timeout is None else timeout):
+            return False
+
+        self.writer_owner = threading.get_ident()
+        for stripe in self.stripes:
+            with stripe.drained:
+                stripe.writer_active = True
+                remaining = None if deadline is None else max(0, deadline - time.monotonic())
+                drained = stripe.drained.wait_for(lambda: stripe.readers == 0, remaining)
+            if not drained:
+                self._finish_write()
+                return False
+        return True
+
+    def _finish_write(self):
+        self.writer_owner = None
+        for stripe in self.stripes:
+            with stripe.drained:
+                stripe.writer_active = False
+                stripe.drained.notify_all()
+        self.writer_lock.release()
+
+    def release_write(self):
+        if self.writer_owner != threading.get_ident():
+            raise RuntimeError("release_write() called by a thread not holding the write lock")
+        self._finish_write()
+
+    @contextmanager
+    def read_locked(self, timeout=None):
+        if not self.acquire_read(timeout):
+            raise TimeoutError(f"Unable to acquire read lock within {timeout} seconds")
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self, timeout=None):
+        if not self.acquire_write(timeout):
+            raise TimeoutError(f"Unable to acquire write lock within {timeout} seconds")
+        try:
+            yield self
+        finally:
+            self.release_write()
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    # Tiny read critical sections from many threads, 1 writer updating every 10ms.
+    for lock in [RWLock(), BigReaderLock()]:
+        table = {"version": 0}
+        read_counts = []
+        torn_reads = [0]
+        go = threading.Event()
+        stop = threading.Event()
+
+        def reader():
+            # Wait until every thread has started, busy readers can starve Thread.start().
+            go.wait()
+            reads = 0
+            while not stop.is_set():
+                with lock.read_locked():
+                    if table["version"] != table.get("copy", 0):
+                        torn_reads[0] += 1
+                reads += 1
+            read_counts.append(reads)
+
+        def writer():
+            go.wait()
+            while not stop.is_set():
+                with lock.write_locked():
+                    table["version"] += 1
+                    time.sleep(0.0001)
+                    table["copy"] = table["version"]
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=reader) for _ in range(16)] + [threading.Thread(target=writer)]
+        for t in threads:
+            t.start()
+        go.set()
+        time.sleep(1)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        print(f"{type(lock).__name__}: {sum(read_counts)} reads/sec, {table['version']} writes, "
+              f"torn reads: {torn_reads[0]}")
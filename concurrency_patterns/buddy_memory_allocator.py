@@ -129,29 +129,30 @@ class BuddyMemoryAllocator:
         self._merge_buddies(ptr, exponent)
 
 
-######## TESTING #################
-allocator = BuddyMemoryAllocator(1024)
+if __name__ == "__main__":
+    ######## TESTING #################
+    allocator = BuddyMemoryAllocator(1024)
 
-# Allocate a block of 100 units
-ptr1 = allocator.allocate(100)
-print(f"Allocated 100 units at address: {ptr1}")
+    # Allocate a block of 100 units
+    ptr1 = allocator.allocate(100)
+    print(f"Allocated 100 units at address: {ptr1}")
 
-# Allocate another block of 200 units
-ptr2 = allocator.allocate(200)
-print(f"Allocated 200 units at address: {ptr2}")
+    # Allocate another block of 200 units
+    ptr2 = allocator.allocate(200)
+    print(f"Allocated 200 units at address: {ptr2}")
 
-# Free the first block
-allocator.free(ptr1)
-print(f"Freed block at address: {ptr1}")
+    # Free the first block
+    allocator.free(ptr1)
+    print(f"Freed block at address: {ptr1}")
 
-# Free the second block
-allocator.free(ptr2)
-print(f"Freed block at address: {ptr2}")
+    # Free the second block
+    allocator.free(ptr2)
+    print(f"Freed block at address: {ptr2}")
 
-# Now allocate 512 units
-ptr3 = allocator.allocate(512)
-print(f"Allocated 512 units at address: {ptr3}")
+    # Now allocate 512 units
+    ptr3 = allocator.allocate(512)
+    print(f"Allocated 512 units at address: {ptr3}")
 
-# Final: Free 512 units
-allocator.free(ptr3)
-print(f"Freed block at address: {ptr3}")
+    # Final: Free 512 units
+    allocator.free(ptr3)
+    print(f"Freed block at address: {ptr3}")
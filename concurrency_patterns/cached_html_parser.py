@@ -0,0 +1,188 @@
+"""
+Problem Statement:
+    - Recrawls call HtmlParser.getUrls on the same pages again and again, though most pages
+      have not changed since last crawl.
+    - Add a caching wrapper around the parser:
+        - Bounded number of entries (LRU eviction).
+        - Per entry TTL, so changed pages are eventually fetched again.
+        - Optional on-disk store, so cache survives across crawler runs.
+        - Concurrent misses on same url should fetch it only once.
+
+Approach:
+    - CachingHtmlParser(parser) exposes same getUrls(url) interface, so it can be passed to
+      any WebCrawler as htmlParser.
+
+    - Memory: OrderedDict url -> (urls, expires_at)
+        - hit: move_to_end (most recently used).
+        - insert: popitem(last=False) while size > max_entries (least recently used).
+        - max_entries bounds entry count, not bytes: memory ~ max_entries * (avg links per page
+          * avg url size), size it from that.
+        - expired entry is treated as a miss and removed.
+
+    - Disk: SqliteUrlStore (table url -> json list of urls, expires_at).
+        - Checked on memory miss, written on fetch. Uses wall clock (time.time()) for expiry
+          since entries outlive the process.
+
+    - Single flight (coalescing concurrent misses):
+        - in_flight: url -> InFlightFetch(Event, result, error)
+        - First thread missing url becomes the leader and fetches, others wait on its event
+          and share the result. On error each waiter raises its own CoalescedFetchError chained
+          from the leader's exception (re-raising one instance from many threads would keep
+          rewriting its __traceback__).
+        - Leader removes in_flight entry and sets event in finally, so waiters never hang.
+
+    - Lock is only held for dict operations, never during fetch or disk io.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from .multithreaded_webcrawler_v2 import HtmlParser, crawl
+
+
+class SqliteUrlStore:
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS page_urls (url TEXT PRIMARY KEY, urls TEXT, expires_at REAL)"
+            )
+
+    def get(self, url, now):
+        with self.lock:
+            row = self.conn.execute("SELECT urls, expires_at FROM page_urls WHERE url = ?", (url,)).fetchone()
+        if row is None or row[1] <= now:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, url, urls, expires_at):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO page_urls (url, urls, expires_at) VALUES (?, ?, ?)",
+                (url, json.dumps(urls), expires_at),
+            )
+
+    def purge_expired(self, now=None):
+        now = time.time() if now is None else now
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM page_urls WHERE expires_at <= ?", (now,))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class CoalescedFetchError(Exception):
+    pass
+
+
+class InFlightFetch:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class CachingHtmlParser:
+    def __init__(self, parser, max_entries=100_000, ttl=3600, store=None):
+        self.parser = parser
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.store = store
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.in_flight = {}
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0}
+
+    def _put_in_memory(self, url, urls, expires_at):
+        with self.lock:
+            self.entries[url] = (urls, expires_at)
+            self.entries.move_to_end(url)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def getUrls(self, url: str) -> list[str]:
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                if entry[1] > now:
+                    self.entries.move_to_end(url)
+                    self.stats["hits"] += 1
+                    return list(entry[0])
+                del self.entries[url]
+
+            flight = self.in_flight.get(url)
+            is_leader = flight is None
+            if is_leader:
+                flight = InFlightFetch()
+                self.in_flight[url] = flight
+            else:
+                self.stats["coalesced"] += 1
+
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise CoalescedFetchError(f"Fetch of {url} failed in another thread") from flight.error
+            return list(flight.result)
+
+        try:
+            cached = self.store.get(url, now) if self.store is not None else None
+            if cached is not None:
+                urls, expires_at = cached
+                with self.lock:
+                    self.stats["disk_hits"] += 1
+            else:
+                urls = self.parser.getUrls(url)
+                expires_at = time.time() + self.ttl
+                with self.lock:
+                    self.stats["misses"] += 1
+                if self.store is not None:
+                    self.store.put(url, urls, expires_at)
+
+            self._put_in_memory(url, urls, expires_at)
+            flight.result = urls
+            return list(urls)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[url]
+            flight.done.set()
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    graph = {f"http://site.com/{i}": [f"http://site.com/{j}" for j in range(i + 1, min(i + 4, 30))] for i in range(30)}
+    slow_parser = HtmlParser(graph, latency=0.05)
+
+    db_path = os.path.join(tempfile.mkdtemp(), "crawl_cache.db")
+    store = SqliteUrlStore(db_path)
+    parser = CachingHtmlParser(slow_parser, max_entries=1000, ttl=60, store=store)
+
+    for attempt in range(2):
+        start = time.monotonic()
+        urls = crawl("http://site.com/0", parser, num_threads=4)
+        print(f"Crawl {attempt + 1}: {len(urls)} urls in {time.monotonic() - start:.2f}s, stats: {parser.stats}")
+
+    # New process / new cache object, served from disk.
+    restarted = CachingHtmlParser(slow_parser, max_entries=1000, ttl=60, store=store)
+    start = time.monotonic()
+    urls = crawl("http://site.com/0", restarted, num_threads=4)
+    print(f"After restart: {len(urls)} urls in {time.monotonic() - start:.2f}s, stats: {restarted.stats}")
+
+    # Concurrent misses on same url are coalesced into one fetch.
+    coalescing = CachingHtmlParser(HtmlParser(graph, latency=0.5))
+    threads = [threading.Thread(target=coalescing.getUrls, args=("http://site.com/0",)) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(f"5 concurrent getUrls on same url, stats: {coalescing.stats}")
+    store.close()
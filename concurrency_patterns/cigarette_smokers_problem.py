@@ -0,0 +1,132 @@
+"""
+Problem:
+
+There are:
+    - One agent
+    - Three smokers
+        - Each smoker has one of the three ingredients needed to roll a cigarette:
+            - Smoker A has tobacco
+            - Smoker B has paper
+            - Smoker C has matches
+    
+The agent randomly places two of the three ingredients on the table.
+Rules:
+    - The smoker who has the third missing ingredient (the one not placed on the 
+      table) picks up the two ingredients, makes a cigarette, and smokes.
+
+Approach
+    - Agent Thread
+    - Three Smoker threads:
+        Smoker: (id, ingredient)
+    - smoker_turn: one Condition per ingredient (all on the table lock). put_ingredients wakes
+      only the smoker holding the missing ingredient, instead of notify_all to every smoker.
+    - table_free: Condition the agent waits on until previous ingredients were taken and that
+      smoker finished smoking.
+    - close(): agent is done. Waits until the last ingredients were smoked, then wakes every
+      smoker to exit (which smoker gets a turn is random, so smokers can't count their turns).
+    - resource_dispatcher.py generalizes this to any number of resource types and consumers.
+
+"""
+from threading  import Thread, Condition, Lock
+from enum       import Enum
+import time
+import random
+
+class Ingredient(Enum):
+    TOBACCO = 1
+    PAPER = 2
+    MATCHES = 3
+
+class SmokingTable:
+    def __init__(self):
+        self.lock = Lock()
+        self.smoker_turn = {ingredient: Condition(self.lock) for ingredient in Ingredient}
+        self.table_free = Condition(self.lock)
+        self.ingredients_on_table = []
+        self.smoking = False
+        self.closed = False
+    
+    def put_ingredients(self, ingredient_1, ingredient_2):
+        with self.lock:
+            while self.ingredients_on_table or self.smoking:
+                self.table_free.wait()
+
+            self.ingredients_on_table = [ingredient_1, ingredient_2]
+            missing, = set(Ingredient) - {ingredient_1, ingredient_2}
+            self.smoker_turn[missing].notify()
+
+    def take_ingredients(self, ingredient):
+        """
+        Blocks until the two other ingredients are on the table and takes them. False once
+        the table is closed.
+        """
+        with self.lock:
+            while not self.closed and (len(self.ingredients_on_table) < 2 or ingredient in self.ingredients_on_table):
+                self.smoker_turn[ingredient].wait()
+            if self.closed:
+                return False
+
+            # Take all ingrdients
+            self.ingredients_on_table = []
+            self.smoking = True
+            return True
+
+    def done_smoking(self):
+        with self.lock:
+            self.smoking = False
+            self.table_free.notify()
+
+    def close(self):
+        with self.lock:
+            while self.ingredients_on_table or self.smoking:
+                self.table_free.wait()
+            self.closed = True
+            for turn in self.smoker_turn.values():
+                turn.notify_all()
+
+
+class Smoker(Thread):
+    def __init__(self, name, ingredient, smoking_table: SmokingTable):
+        super().__init__()
+        self.name = name
+        self.ingredient = ingredient
+        self.table = smoking_table
+    
+    def smoke(self):
+        while self.table.take_ingredients(self.ingredient):
+            print(f"Thread {self.name} is smoking with ingredient {self.ingredient}")
+            time.sleep(random.uniform(0.5, 1))
+            self.table.done_smoking()
+    
+    def run(self):
+        self.smoke()
+
+class Agent(Thread):
+    def __init__(self, smoking_table:SmokingTable):
+        super().__init__()
+        self.smoking_table = smoking_table
+    
+    def put_ingredients(self):
+        ingredient_1, ingredient_2 = random.sample(list(Ingredient), k=2)
+        print(f"Placing {ingredient_1} and {ingredient_2} on table")
+        self.smoking_table.put_ingredients(ingredient_1, ingredient_2)
+    
+    def run(self):
+        for _ in range(5):
+            time.sleep(2)
+            self.put_ingredients()
+        self.smoking_table.close()
+
+
+if __name__ == "__main__":
+    smoking_tbl = SmokingTable()
+    agent = Agent(smoking_tbl)
+    smokers = [Smoker(name, ingredient, smoking_tbl)  for (name, ingredient) in [("A", Ingredient.TOBACCO), 
+                                                                                 ("B", Ingredient.MATCHES),
+                                                                              ("C", Ingredient.PAPER)]]
+
+    for thread in smokers + [agent]:
+        thread.start()
+
+    for thread in smokers + [agent]:
+        thread.join()
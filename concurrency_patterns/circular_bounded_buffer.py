@@ -37,15 +37,18 @@ import threading
 import time
 import random
 
+from .lock_profiler import new_condition, new_lock
+
 class CircularBoundedBuffer:
-    def __init__(self, capacity):
+    def __init__(self, capacity, profiler=None):
+        # profiler: optional LockProfiler (lock_profiler.py) to record contention.
         self.size = capacity
         self.buffer = [None]*capacity
-        self.lock = threading.Lock() 
+        self.lock = new_lock("CircularBoundedBuffer.lock", profiler)
         self.consumer_index = 0
         self.producer_index = 0
-        self.space_available = threading.Condition(self.lock)
-        self.content_available = threading.Condition(self.lock)
+        self.space_available = new_condition(self.lock, "CircularBoundedBuffer.space_available", profiler)
+        self.content_available = new_condition(self.lock, "CircularBoundedBuffer.content_available", profiler)
     
     def produce(self, id):
         # For DEMO a producer will produce 5 times. (It could be a stream also in reality)
@@ -80,14 +83,15 @@ class CircularBoundedBuffer:
                 self.space_available.notify_all()
                 self.consumer_index = (self.consumer_index + 1) % self.size
 
-##### TESTING #######
-cbb = CircularBoundedBuffer(3)
+if __name__ == "__main__":
+    ##### TESTING #######
+    cbb = CircularBoundedBuffer(3)
 
-producers = [threading.Thread(target=cbb.produce, args=(id,)) for id in range(1, 3)]
-consumers = [threading.Thread(target=cbb.consume, args=(id,)) for id in range(1, 3)]
+    producers = [threading.Thread(target=cbb.produce, args=(id,)) for id in range(1, 3)]
+    consumers = [threading.Thread(target=cbb.consume, args=(id,)) for id in range(1, 3)]
 
-for t in producers + consumers:
-    t.start()
+    for t in producers + consumers:
+        t.start()
 
-for t in producers + consumers:
-    t.join()
\ No newline at end of file
+    for t in producers + consumers:
+        t.join()
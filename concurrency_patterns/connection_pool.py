@@ -0,0 +1,334 @@
+"""
+Problem Statement:
+    - concepts.txt: a Semaphore(n) allows only n threads to use a db connection at a time, but
+      every request still opens (and closes) its own connection. Connect is often far slower
+      than the query itself.
+    - Thread safe pool of reusable connections:
+        - min_size / max_size, connections created lazily (only when no idle one is free).
+        - Idle eviction: connections idle longer than idle_timeout are closed, pool shrinks back
+          to min_size.
+        - Health check when a connection is returned, broken connections are closed and never
+          handed out again.
+        - acquire(timeout) raises TimeoutError if no connection becomes free in time.
+        - Pool wait metrics, to tell whether max_size is too small.
+    - In process fake backend with configurable latency, to benchmark without a database.
+
+Approach:
+    - Semaphore(max_size) counts connections checked out. acquire() takes a permit first, then
+      takes an idle connection or creates one. A connection is only created while holding a
+      permit and with no idle one left --> connections in use + idle <= max_size.
+    - idle is a deque of (connection, returned_at):
+        - Returned connections are appended on the right, acquire pops from the right (LIFO),
+          so a few hot connections serve the load and the rest age out on the left.
+        - evict_idle() closes connections from the left while idle > idle_timeout and pool size
+          > min_size. Runs on every release, and every reaper_interval seconds from a reaper
+          thread if one is requested (an idle pool has no releases).
+    - connect(), close() and health_check() may do I/O, so they run outside the pool lock.
+      Failed connect gives the permit back.
+    - release(connection):
+        - health_check(connection) False or raising, pool closed, or a ConnectionError raised
+          inside connection() --> close, pool size shrinks.
+        - Otherwise back to idle, permit released.
+    - Metrics under the pool lock: pool_wait (time to get a permit) and connect_time
+      histograms (barber_pool.Histogram), counters for created / closed / evicted / failed
+      health checks / timeouts, peak connections in use.
+
+Note:
+    - min_size is a floor for eviction, not a prefill: the pool starts empty (lazy creation).
+    - Health check happens on return only. A connection broken while idle (e.g. server restart)
+      is found on its next use; connection() then discards it.
+"""
+import contextlib
+import threading
+import time
+from collections import deque
+
+from .barber_pool import Histogram
+from .lock_profiler import new_lock, new_semaphore
+
+
+class ConnectionPool:
+    def __init__(self, connect, min_size=0, max_size=10, idle_timeout=60.0, health_check=None,
+                 acquire_timeout=None, reaper_interval=None, profiler=None):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError(f"Need 0 <= min_size <= max_size and max_size >= 1, got {min_size}, {max_size}")
+        self.connect = connect  # () -> new connection
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check = health_check  # connection -> bool, None: always healthy
+        self.acquire_timeout = acquire_timeout  # default for acquire(), None: wait forever
+
+        # profiler: optional LockProfiler (lock_profiler.py) to record contention.
+        self.lock = new_lock("ConnectionPool.lock", profiler)
+        self.permits = new_semaphore(max_size, "ConnectionPool.permits", profiler)
+        self.idle = deque()
+        self.in_use = set()
+        self.size = 0  # open connections, in use + idle
+        self.is_closed = False
+
+        self.pool_wait = Histogram()
+        self.connect_time = Histogram()
+        self.counters = {"acquired": 0, "waited": 0, "timeouts": 0, "created": 0, "closed": 0,
+                         "evicted_idle": 0, "failed_health_checks": 0}
+        self.peak_in_use = 0
+
+        self.reaper_stop = threading.Event()
+        self.reaper = None
+        if reaper_interval is not None:
+            self.reaper = threading.Thread(target=self._reap, args=(reaper_interval,), daemon=True)
+            self.reaper.start()
+
+    def acquire(self, timeout=None):
+        timeout = self.acquire_timeout if timeout is None else timeout
+        if self.is_closed:
+            raise RuntimeError("ConnectionPool is closed")
+
+        start = time.monotonic()
+        acquired = self.permits.acquire(timeout=timeout)
+        waited = time.monotonic() - start
+        with self.lock:
+            self.pool_wait.record(waited)
+            if waited > 0.001:
+                self.counters["waited"] += 1
+            if not acquired:
+                self.counters["timeouts"] += 1
+                raise TimeoutError(f"Unable to acquire a connection within {timeout} seconds")
+            if self.is_closed:
+                self.permits.release()
+                raise RuntimeError("ConnectionPool is closed")
+            connection = self.idle.pop()[0] if self.idle else None
+            if connection is None:
+                self.size += 1  # reserve the slot before connecting outside the lock
+
+        if connection is None:
+            connect_start = time.monotonic()
+            try:
+                connection = self.connect()
+            except BaseException:
+                with self.lock:
+                    self.size -= 1
+                self.permits.release()
+                raise
+            with self.lock:
+                self.connect_time.record(time.monotonic() - connect_start)
+                self.counters["created"] += 1
+
+        with self.lock:
+            self.in_use.add(connection)
+            self.counters["acquired"] += 1
+            self.peak_in_use = max(self.peak_in_use, len(self.in_use))
+        return connection
+
+    def release(self, connection, broken=False):
+        with self.lock:
+            if connection not in self.in_use:
+                raise RuntimeError("release() called with a connection not acquired from this pool")
+
+        healthy = not broken
+        if healthy and self.health_check is not None:
+            try:
+                healthy = bool(self.health_check(connection))
+            except Exception:
+                healthy = False
+
+        with self.lock:
+            self.in_use.discard(connection)
+            if not healthy:
+                self.counters["failed_health_checks"] += 1
+            keep = healthy and not self.is_closed
+            if keep:
+                self.idle.append((connection, time.monotonic()))
+            else:
+                self.size -= 1
+                self.counters["closed"] += 1
+        if not keep:
+            self._close(connection)
+        self.permits.release()
+        self.evict_idle()
+
+    @contextlib.contextmanager
+    def connection(self, timeout=None):
+        conn = self.acquire(timeout)
+        broken = False
+        try:
+            yield conn
+        except ConnectionError:
+            broken = True
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    def evict_idle(self):
+        """
+        Closes connections idle longer than idle_timeout, oldest first, down to min_size.
+        """
+        now = time.monotonic()
+        evicted = []
+        with self.lock:
+            while self.idle and self.size > self.min_size and now - self.idle[0][1] > self.idle_timeout:
+                evicted.append(self.idle.popleft()[0])
+                self.size -= 1
+            self.counters["evicted_idle"] += len(evicted)
+            self.counters["closed"] += len(evicted)
+        for connection in evicted:
+            self._close(connection)
+        return len(evicted)
+
+    def _reap(self, interval):
+        while not self.reaper_stop.wait(interval):
+            self.evict_idle()
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass  # already broken, nothing left to clean up
+
+    def close(self):
+        """
+        Closes idle connections now; connections in use are closed when released.
+        """
+        self.reaper_stop.set()
+        with self.lock:
+            self.is_closed = True
+            idle = [connection for connection, _ in self.idle]
+            self.idle.clear()
+            self.size -= len(idle)
+            self.counters["closed"] += len(idle)
+        for connection in idle:
+            self._close(connection)
+        if self.reaper is not None:
+            self.reaper.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "size": self.size,
+                "in_use": len(self.in_use),
+                "idle": len(self.idle),
+                "peak_in_use": self.peak_in_use,
+                **self.counters,
+                "pool_wait": self.pool_wait.to_dict(),
+                "connect_time": self.connect_time.to_dict(),
+            }
+
+
+###### FAKE BACKEND #########
+
+class FakeBackend:
+    """
+    In process stand in for a database server: connect and every query just sleep.
+    restart() breaks every connection opened so far, like a server restart.
+    """
+    def __init__(self, connect_latency=0.02, query_latency=0.001):
+        self.connect_latency = connect_latency
+        self.query_latency = query_latency
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.connects = 0
+        self.open_connections = 0
+
+    def connect(self):
+        time.sleep(self.connect_latency)
+        with self.lock:
+            self.connects += 1
+            self.open_connections += 1
+            return FakeConnection(self, self.generation)
+
+    def restart(self):
+        with self.lock:
+            self.generation += 1
+
+
+class FakeConnection:
+    def __init__(self, backend, generation):
+        self.backend = backend
+        self.generation = generation
+        self.closed = False
+
+    def ping(self):
+        return not self.closed and self.generation == self.backend.generation
+
+    def execute(self, query):
+        if not self.ping():
+            raise ConnectionError("connection is closed or was dropped by the server")
+        time.sleep(self.backend.query_latency)
+        return f"result of {query}"
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            with self.backend.lock:
+                self.backend.open_connections -= 1
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    # 16 threads x 25 requests, connect 20ms, query 2ms: new connection per request vs a pool
+    # of 8 connections.
+    threads_count, requests = 16, 25
+
+    def run(handle):
+        threads = [threading.Thread(target=lambda: [handle(i) for i in range(requests)]) for _ in range(threads_count)]
+        start = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return threads_count * requests / (time.monotonic() - start)
+
+    backend = FakeBackend(connect_latency=0.02, query_latency=0.002)
+
+    def per_request(i):
+        connection = backend.connect()
+        try:
+            connection.execute(f"SELECT {i}")
+        finally:
+            connection.close()
+
+    throughput = run(per_request)
+    print(f"connect per request: {throughput:.0f} req/s, {backend.connects} connects")
+
+    backend = FakeBackend(connect_latency=0.02, query_latency=0.002)
+    with ConnectionPool(backend.connect, min_size=2, max_size=8, health_check=FakeConnection.ping) as pool:
+        def pooled(i):
+            with pool.connection() as connection:
+                connection.execute(f"SELECT {i}")
+
+        throughput = run(pooled)
+        stats = pool.stats()
+        print(f"pooled (max 8):      {throughput:.0f} req/s, {backend.connects} connects, "
+              f"pool wait p50/p99 {stats['pool_wait']['p50_ms']}/{stats['pool_wait']['p99_ms']}ms, "
+              f"waited {stats['waited']}/{stats['acquired']}")
+
+        # Server restart while connections are in use: health check on return drops them.
+        held = [pool.acquire() for _ in range(4)]
+        backend.restart()
+        for connection in held:
+            pool.release(connection)
+        print(f"after restart: failed health checks {pool.stats()['failed_health_checks']}, "
+              f"pool size {pool.stats()['size']}")
+
+    # Acquire timeout and idle eviction.
+    backend = FakeBackend(connect_latency=0.001, query_latency=0.0)
+    pool = ConnectionPool(backend.connect, min_size=1, max_size=3, idle_timeout=0.1, reaper_interval=0.05)
+    held = [pool.acquire() for _ in range(3)]
+    try:
+        pool.acquire(timeout=0.05)
+    except TimeoutError as e:
+        print(f"4th acquire on a pool of 3: {e}")
+    for connection in held:
+        pool.release(connection)
+    time.sleep(0.3)
+    print(f"after 0.3s idle: pool size {pool.stats()['size']} (min 1), evicted {pool.stats()['evicted_idle']}, "
+          f"backend open connections {backend.open_connections}")
+    pool.close()
+    print(f"closed: backend open connections {backend.open_connections}")
@@ -0,0 +1,167 @@
+"""
+Problem Statement:
+
+There are 5 philosophers sitting at a round table. Each philosopher does two things:
+    - Think
+    - Eat
+
+Between each pair of philosophers is one fork, and a philosopher needs both left and right 
+forks to eat. Philosophers must avoid deadlock (where everyone is holding one fork and waiting 
+for another) and starvation (where one philosopher never gets to eat).
+
+
+Approach 1 (resource ordering), Philospher / ForkOrderingTable:
+
+    - Problems here will be circular wait, if every philospher thread tries to pick fork in clockwise direction.
+    - To break circular wait, schedule threads to pick fork based on ids assigned:
+        - odd id threads can pick left fork 
+        - even id threads should pick right fork.
+    
+    - A philospher thread should have access to left and right fork locks, that will be needed for eating.
+    - Philospher object:
+        - philoshper_id
+        - left_lock
+        - right_lock
+
+Tables (ForkOrderingTable, WaiterTable, ChandyMisraTable) expose pick_up(id) / put_down(id),
+so dining_philospher_benchmark.py can run all three with N philosophers.
+
+Approach 2 (waiter), WaiterTable:
+    - A waiter (Semaphore(N-1)) gives out at most N-1 seats. With one philosopher standing, at
+      least one seated philosopher can always get both forks, so there is no circular wait.
+    - Seat first, then left fork, then right fork. Put down in reverse and give seat back.
+
+Approach 3 (Chandy-Misra), ChandyMisraTable:
+    - Every fork has an owner and is clean or dirty. Initially each fork is dirty and owned by
+      lower id of the two philosophers sharing it (precedence graph is acyclic).
+    - Hungry philosopher takes a neighbour's fork if that fork is dirty and its owner is not
+      eating. Fork is cleaned when handed over, and a clean fork is never given away, so the
+      neighbour who just lost it gets priority next time --> no deadlock, no starvation.
+    - Eating makes both forks dirty. On finishing, a dirty fork is handed (cleaned) to a
+      neighbour already hungry for it, and only the two neighbours are woken. Without the
+      hand-off the philosopher could re-acquire its forks before the woken neighbour runs.
+    - Shared memory version: one table lock guards fork/state bookkeeping (never held while
+      eating), every philosopher waits on its own Condition over that lock.
+"""
+from threading import Condition, Lock, Semaphore, Thread
+import time
+import random
+
+class Philospher(Thread):
+    def __init__(self, id, left_fork: Lock, right_fork: Lock):
+        super().__init__()  
+        self.id = id
+        self.left_fork = left_fork
+        self.right_fork = right_fork
+    
+    def think(self):
+        print(f"I am {self.id} thinking...")
+        time.sleep(random.uniform(0.5,1))
+    
+    def eat(self):
+        # Acquire lock based on order defined for even and odd phiosphers.
+        first, second = (self.left_fork, self.right_fork) if self.id & 1 else (self.right_fork, self.left_fork)
+        with first:
+            with second:
+                print(f"I am {self.id} eating..")
+                time.sleep(random.uniform(1, 1.5))
+    
+    def run(self):
+        for _ in range(3):
+            self.think()
+            self.eat()
+
+
+class ForkOrderingTable:
+    def __init__(self, n):
+        self.n = n
+        self.forks = [Lock() for _ in range(n)]
+
+    def _forks(self, id):
+        left, right = self.forks[id], self.forks[(id + 1) % self.n]
+        return (left, right) if id & 1 else (right, left)
+
+    def pick_up(self, id):
+        first, second = self._forks(id)
+        first.acquire()
+        second.acquire()
+
+    def put_down(self, id):
+        first, second = self._forks(id)
+        second.release()
+        first.release()
+
+
+class WaiterTable:
+    def __init__(self, n):
+        self.n = n
+        self.forks = [Lock() for _ in range(n)]
+        self.seats = Semaphore(n - 1)
+
+    def pick_up(self, id):
+        self.seats.acquire()
+        self.forks[id].acquire()
+        self.forks[(id + 1) % self.n].acquire()
+
+    def put_down(self, id):
+        self.forks[(id + 1) % self.n].release()
+        self.forks[id].release()
+        self.seats.release()
+
+
+class ChandyMisraFork:
+    def __init__(self, owner):
+        self.owner = owner
+        self.dirty = True
+
+
+class ChandyMisraTable:
+    THINKING, HUNGRY, EATING = range(3)
+
+    def __init__(self, n):
+        self.n = n
+        self.lock = Lock()
+        self.turn = [Condition(self.lock) for _ in range(n)]
+        self.state = [self.THINKING] * n
+        # Fork id is between philosopher id and id + 1.
+        self.forks = [ChandyMisraFork(min(id, (id + 1) % n)) for id in range(n)]
+
+    def pick_up(self, id):
+        left, right = self.forks[id], self.forks[(id - 1) % self.n]
+        with self.lock:
+            self.state[id] = self.HUNGRY
+            while True:
+                for fork in (left, right):
+                    if fork.owner != id and fork.dirty and self.state[fork.owner] != self.EATING:
+                        fork.owner = id
+                        fork.dirty = False
+                if left.owner == id and right.owner == id:
+                    break
+                self.turn[id].wait()
+
+            self.state[id] = self.EATING
+            left.dirty = right.dirty = True
+
+    def put_down(self, id):
+        with self.lock:
+            self.state[id] = self.THINKING
+            for fork, neighbour in ((self.forks[id], (id + 1) % self.n), (self.forks[(id - 1) % self.n], (id - 1) % self.n)):
+                if self.state[neighbour] == self.HUNGRY and fork.owner == id:
+                    # Hand the dirty fork over (cleaned) now, so this philosopher can't
+                    # take it again before the waiting neighbour wakes up.
+                    fork.owner = neighbour
+                    fork.dirty = False
+                self.turn[neighbour].notify()
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    # | 0 | 1 | 2 | 3 | 4 
+    forks = [Lock() for _ in range(5)]
+    philosphers = [Philospher(id, forks[id], forks[(id+1)%5]) for id in range(5)]
+
+    for philospher in philosphers:
+        philospher.start()
+
+    for philospher in philosphers:
+        philospher.join()    
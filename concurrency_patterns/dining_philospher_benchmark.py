@@ -0,0 +1,115 @@
+"""
+Problem Statement:
+    - dining_philospher.py has three strategies (fork ordering, waiter, Chandy-Misra). Same
+      pattern schedules jobs which each need two shared resources.
+    - Which strategy gives best throughput at N=64, and how fair is it?
+    - Run each strategy with N philosophers for a fixed duration and report:
+        - meals/sec
+        - spread of meals per philosopher (min, max, coefficient of variation)
+        - max wait (hungry --> eating)
+
+Approach:
+    - One thread per philosopher: think, pick_up, eat, put_down until stop is set.
+    - think / eat are sleeps of random length (own seeded random per philosopher, repeatable),
+      so the run measures scheduling, not the GIL.
+    - Wait = time spent in pick_up.
+    - Stall detection like rw_lock_benchmark.py: threads are daemons, a case whose threads
+      don't stop within stall_timeout is reported with deadlocked=True.
+
+Findings (N=64, think/eat 1-5ms):
+    - fork_ordering and chandy_misra are close (~7.5k meals/s), Chandy-Misra has lower spread.
+    - waiter is ~half: N-1 seats barely limit anything at N=64, but every philosopher takes
+      left then right, so waits chain around the table (one slow eater blocks a whole run
+      of neighbours). max wait is highest there too.
+
+Usage:
+    python -m concurrency_patterns.dining_philospher_benchmark --n 64 --duration 2 --think-ms 1 5 --eat-ms 1 5 --json out.json
+"""
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+
+from .dining_philospher import ChandyMisraTable, ForkOrderingTable, WaiterTable
+
+STRATEGIES = {
+    "fork_ordering": ForkOrderingTable,
+    "waiter": WaiterTable,
+    "chandy_misra": ChandyMisraTable,
+}
+
+
+def run_strategy(strategy, n=64, duration=2.0, think_ms=(1, 5), eat_ms=(1, 5), seed=0, stall_timeout=2.0):
+    table = STRATEGIES[strategy](n)
+    go = threading.Event()
+    stop = threading.Event()
+    meals = [0] * n
+    max_waits = [0.0] * n
+
+    def philosopher(id):
+        rng = random.Random(seed * 1000 + id)
+        go.wait()
+        while not stop.is_set():
+            time.sleep(rng.uniform(*think_ms) / 1e3)
+            start = time.perf_counter()
+            table.pick_up(id)
+            max_waits[id] = max(max_waits[id], time.perf_counter() - start)
+            time.sleep(rng.uniform(*eat_ms) / 1e3)
+            table.put_down(id)
+            meals[id] += 1
+
+    threads = [threading.Thread(target=philosopher, args=(id,), daemon=True) for id in range(n)]
+    for t in threads:
+        t.start()
+    start = time.perf_counter()
+    go.set()
+    time.sleep(duration)
+    stop.set()
+    elapsed = time.perf_counter() - start
+    deadline = time.monotonic() + stall_timeout
+    for t in threads:
+        t.join(max(0, deadline - time.monotonic()))
+
+    mean = statistics.mean(meals)
+    return {
+        "strategy": strategy,
+        "n": n,
+        "meals_per_sec": round(sum(meals) / elapsed, 1),
+        "min_meals": min(meals),
+        "max_meals": max(meals),
+        "meals_cv": round(statistics.pstdev(meals) / mean, 3) if mean else 0.0,
+        "max_wait_ms": round(max(max_waits) * 1e3, 2),
+        "deadlocked": any(t.is_alive() for t in threads),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dining philosophers strategy benchmark")
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES), choices=list(STRATEGIES))
+    parser.add_argument("--n", nargs="+", type=int, default=[64])
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds per case")
+    parser.add_argument("--think-ms", nargs=2, type=float, default=[1, 5], metavar=("MIN", "MAX"))
+    parser.add_argument("--eat-ms", nargs=2, type=float, default=[1, 5], metavar=("MIN", "MAX"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json")
+    args = parser.parse_args(argv)
+
+    results = []
+    for n in args.n:
+        for strategy in args.strategies:
+            result = run_strategy(strategy, n, args.duration, args.think_ms, args.eat_ms, args.seed)
+            results.append(result)
+            print(f"{strategy:<14} n={n:<4} meals/s={result['meals_per_sec']:>9}  "
+                  f"meals min/max={result['min_meals']}/{result['max_meals']}  cv={result['meals_cv']:<6} "
+                  f"max_wait={result['max_wait_ms']:>8}ms{'  DEADLOCKED' if result['deadlocked'] else ''}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -72,12 +72,13 @@ class EarlyStopSimulation:
 
         print(f"[Thread-{thread_id}] Simulation done.")
 
-# Start the simulation
-simulation = EarlyStopSimulation()
-threads = [threading.Thread(target=simulation.run) for _ in range(4)]
+if __name__ == "__main__":
+    # Start the simulation
+    simulation = EarlyStopSimulation()
+    threads = [threading.Thread(target=simulation.run) for _ in range(4)]
 
-for t in threads:
-    t.start()
+    for t in threads:
+        t.start()
 
-for t in threads:
-    t.join()
\ No newline at end of file
+    for t in threads:
+        t.join()
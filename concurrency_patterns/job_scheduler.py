@@ -18,12 +18,14 @@ Approach:
 import threading
 from collections import defaultdict
 
+from .lock_profiler import new_lock
+
 class JobScheduler:
-    def __init__(self):
+    def __init__(self, profiler=None):
         self.dependency_graph = defaultdict(set)  # job -> jobs it depends on
         self.jobs = set()                         # all jobs
         self.finished_jobs = set()                # jobs completed
-        self.lock = threading.Lock()              # lock for finished_jobs
+        self.lock = new_lock("JobScheduler.lock", profiler)  # lock for finished_jobs, profiler: optional LockProfiler
 
     def add_job(self, job_name, depends_on=None):
         depends_on = depends_on or []
@@ -0,0 +1,308 @@
+"""
+Problem Statement:
+    - Every module builds directly on threading.Lock / Condition / Semaphore, with no visibility
+      into contention. Which lock is hottest in production?
+    - Drop-in instrumented versions recording per named primitive:
+        - acquire wait time, hold time, contended acquire count
+        - condition waits and spurious wakeups (woken, but had to wait again)
+    - Cheap, sampling based collection and an aggregated report.
+    - Buffers, RW locks, crawler and scheduler can use them optionally.
+
+Approach:
+    - LockProfiler(sample_rate) creates primitives and keeps the registry:
+        - profiler.lock(name), profiler.condition(lock, name), profiler.semaphore(value, name)
+        - report(): stats aggregated by (kind, name), so all RWLock instances named "RWLock"
+          add up. Sorted by total wait, hottest first.
+    - Optional use: new_lock / new_condition / new_semaphore(..., profiler=None) return plain
+      threading primitives when profiler is None, instrumented ones otherwise. Classes take a
+      profiler=None argument and create their primitives through these helpers, so without a
+      profiler nothing changes.
+
+    - InstrumentedLock:
+        - acquire(): try acquire(blocking=False) first. Success --> uncontended, nothing timed.
+          Failure --> contended, blocking acquire is timed (it is slow anyway).
+        - Hold time is sampled: every sample_every-th acquisition records its start, release
+          records the duration. report() extrapolates total hold from the sample.
+        - Stats are updated while holding the lock itself, so they need no extra lock.
+        - Implements _is_owned / _release_save / _acquire_restore, so threading.Condition works
+          on it (re-acquire after Condition.wait counts as an acquisition too).
+    - InstrumentedCondition (threading.Condition subclass):
+        - wait() records waits, wait time, timeouts.
+        - Spurious wakeup: a thread which was notified calls wait() again on the same condition
+          without releasing the lock in between, i.e. it woke up and could not proceed (the
+          while-not-predicate-wait pattern used everywhere here, and wait_for).
+        - Tracked with the lock's epoch (InstrumentedLock counts every acquisition): a notified
+          wait remembers the epoch of its re-acquire, the next wait() of that thread is spurious
+          only if the epoch is unchanged. So it works whether callers enter `with condition:`
+          or `with lock:` (crawlers, executor). Not tracked for a plain threading.Lock.
+    - InstrumentedSemaphore: contended / wait like the lock. Not owned by a thread, so no hold
+      time, and stats need a small lock of their own.
+"""
+import threading
+import time
+from collections import defaultdict
+
+
+class PrimitiveStats:
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.sampled_holds = 0
+        self.hold_total = 0.0
+        self.hold_max = 0.0
+        self.waits = 0
+        self.spurious_wakeups = 0
+        self.timeouts = 0
+
+    def record_wait(self, waited):
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+
+class InstrumentedLock:
+    def __init__(self, stats, sample_every):
+        self._lock = threading.Lock()
+        self.stats = stats
+        self.sample_every = sample_every
+        self._owner = None
+        self._hold_start = None
+        self.epoch = 0  # acquisitions so far, changes whenever the lock was released and re-taken
+
+    def acquire(self, blocking=True, timeout=-1):
+        if self._lock.acquire(False):
+            contended = False
+        elif not blocking:
+            return False
+        else:
+            start = time.perf_counter()
+            if not self._lock.acquire(True, timeout):
+                return False
+            contended = True
+            waited = time.perf_counter() - start
+
+        self.epoch += 1
+        stats = self.stats
+        stats.acquisitions += 1
+        if contended:
+            stats.contended += 1
+            stats.record_wait(waited)
+        self._owner = threading.get_ident()
+        self._hold_start = time.perf_counter() if stats.acquisitions % self.sample_every == 0 else None
+        return True
+
+    def release(self):
+        if self._hold_start is not None:
+            held = time.perf_counter() - self._hold_start
+            stats = self.stats
+            stats.sampled_holds += 1
+            stats.hold_total += held
+            stats.hold_max = max(stats.hold_max, held)
+            self._hold_start = None
+        self._owner = None
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    # Used by threading.Condition.
+    def _is_owned(self):
+        return self._owner == threading.get_ident()
+
+    def _release_save(self):
+        self.release()
+
+    def _acquire_restore(self, state):
+        self.acquire()
+
+
+class InstrumentedCondition(threading.Condition):
+    def __init__(self, lock, stats):
+        super().__init__(lock)
+        self.stats = stats
+        self._epoch_lock = lock if isinstance(lock, InstrumentedLock) else None
+        self._notified_epoch = threading.local()  # lock epoch after this thread's last notified wait
+
+    def wait(self, timeout=None):
+        stats = self.stats
+        epoch_lock = self._epoch_lock
+        if epoch_lock is not None and getattr(self._notified_epoch, "value", None) == epoch_lock.epoch:
+            stats.spurious_wakeups += 1
+        start = time.perf_counter()
+        notified = super().wait(timeout)
+        stats.waits += 1
+        stats.record_wait(time.perf_counter() - start)
+        if not notified:
+            stats.timeouts += 1
+        self._notified_epoch.value = epoch_lock.epoch if notified and epoch_lock is not None else None
+        return notified
+
+
+class InstrumentedSemaphore:
+    def __init__(self, value, stats):
+        self._semaphore = threading.Semaphore(value)
+        self._stats_lock = threading.Lock()
+        self.stats = stats
+
+    def acquire(self, blocking=True, timeout=None):
+        waited = None
+        if not self._semaphore.acquire(False):
+            if not blocking:
+                return False
+            start = time.perf_counter()
+            acquired = self._semaphore.acquire(True, timeout)
+            waited = time.perf_counter() - start
+            if not acquired:
+                with self._stats_lock:
+                    self.stats.timeouts += 1
+                return False
+
+        with self._stats_lock:
+            self.stats.acquisitions += 1
+            if waited is not None:
+                self.stats.contended += 1
+                self.stats.record_wait(waited)
+        return True
+
+    def release(self, n=1):
+        self._semaphore.release(n)
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class LockProfiler:
+    def __init__(self, sample_rate=0.01):
+        self.sample_every = max(1, round(1 / sample_rate))
+        self.primitives = []
+        self.registry_lock = threading.Lock()
+
+    def _register(self, kind, name):
+        stats = PrimitiveStats(kind, name)
+        with self.registry_lock:
+            self.primitives.append(stats)
+        return stats
+
+    def lock(self, name):
+        return InstrumentedLock(self._register("lock", name), self.sample_every)
+
+    def condition(self, lock=None, name=None):
+        name = name or "condition"
+        if lock is None:
+            lock = self.lock(f"{name}.lock")
+        return InstrumentedCondition(lock, self._register("condition", name))
+
+    def semaphore(self, value=1, name=None):
+        return InstrumentedSemaphore(value, self._register("semaphore", name or "semaphore"))
+
+    def report(self):
+        with self.registry_lock:
+            primitives = list(self.primitives)
+
+        groups = defaultdict(list)
+        for stats in primitives:
+            groups[(stats.kind, stats.name)].append(stats)
+
+        rows = []
+        for (kind, name), group in groups.items():
+            acquisitions = sum(s.acquisitions for s in group)
+            sampled_holds = sum(s.sampled_holds for s in group)
+            hold_total = sum(s.hold_total for s in group)
+            rows.append({
+                "kind": kind,
+                "name": name,
+                "instances": len(group),
+                "acquisitions": acquisitions,
+                "contended": sum(s.contended for s in group),
+                "contended_pct": round(100 * sum(s.contended for s in group) / acquisitions, 2) if acquisitions else 0.0,
+                "wait_total_ms": round(sum(s.wait_total for s in group) * 1e3, 3),
+                "wait_max_ms": round(max(s.wait_max for s in group) * 1e3, 3),
+                # Extrapolated from sampled holds.
+                "hold_total_ms": round(hold_total / sampled_holds * acquisitions * 1e3, 3) if sampled_holds else 0.0,
+                "hold_max_ms": round(max(s.hold_max for s in group) * 1e3, 3),
+                "waits": sum(s.waits for s in group),
+                "spurious_wakeups": sum(s.spurious_wakeups for s in group),
+                "timeouts": sum(s.timeouts for s in group),
+            })
+        return sorted(rows, key=lambda row: row["wait_total_ms"], reverse=True)
+
+    def print_report(self, top=10):
+        print(f"{'kind':<10} {'name':<32} {'acq':>9} {'cont%':>6} {'wait ms':>10} {'max ms':>8} "
+              f"{'hold ms':>10} {'waits':>7} {'spurious':>8}")
+        for row in self.report()[:top]:
+            print(f"{row['kind']:<10} {row['name']:<32} {row['acquisitions']:>9} {row['contended_pct']:>6} "
+                  f"{row['wait_total_ms']:>10} {row['wait_max_ms']:>8} {row['hold_total_ms']:>10} "
+                  f"{row['waits']:>7} {row['spurious_wakeups']:>8}")
+
+
+def new_lock(name, profiler=None):
+    return threading.Lock() if profiler is None else profiler.lock(name)
+
+
+def new_condition(lock, name, profiler=None):
+    return threading.Condition(lock) if profiler is None else profiler.condition(lock, name)
+
+
+def new_semaphore(value, name, profiler=None):
+    return threading.Semaphore(value) if profiler is None else profiler.semaphore(value, name)
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    # Bounded buffer where notify_all wakes every consumer for one item (herd), next to a
+    # semaphore guarded pool and a lock with long holds.
+    profiler = LockProfiler(sample_rate=0.1)
+    buffer_lock = profiler.lock("buffer.lock")
+    not_empty = profiler.condition(buffer_lock, "buffer.not_empty")
+    items = []
+    pool = profiler.semaphore(2, "pool")
+    slow_lock = profiler.lock("slow.lock")
+    done = threading.Event()
+
+    def consumer():
+        while True:
+            with not_empty:
+                while not items and not done.is_set():
+                    not_empty.wait(0.1)
+                if not items:
+                    return
+                items.pop()
+
+    def producer():
+        for i in range(2000):
+            with not_empty:
+                items.append(i)
+                not_empty.notify_all()
+            time.sleep(0.0001)
+
+    def pool_user():
+        for _ in range(200):
+            with pool:
+                time.sleep(0.0005)
+            with slow_lock:
+                time.sleep(0.0002)
+
+    threads = ([threading.Thread(target=consumer) for _ in range(8)] +
+               [threading.Thread(target=producer)] + [threading.Thread(target=pool_user) for _ in range(4)])
+    for t in threads:
+        t.start()
+    threads[8].join()
+    for t in threads[9:]:
+        t.join()
+    done.set()
+    for t in threads[:8]:
+        t.join()
+
+    profiler.print_report()
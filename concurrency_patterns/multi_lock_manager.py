@@ -0,0 +1,192 @@
+"""
+Problem Statement:
+    - Philospher.eat (dining_philospher.py) avoids deadlock with a hand written odd/even fork
+      order, which only works for that ring of 2 locks each.
+    - Services often need several fine grained locks at once (e.g. moving state between
+      shards). Want a manager which acquires any set of locks without deadlock, so fine grained
+      locks can replace one coarse lock.
+    - Record per lock wait time and hold time.
+
+Approach:
+    - Every lock is created through the manager: ManagedLock(lock_id, name). lock_id comes from
+      a counter, so ids give one global order over all locks.
+    - acquire(*locks, timeout):
+        - Dedup and sort by lock_id. Every thread takes locks in the same global order, so
+          there is no circular wait (same idea as the odd/even forks, for any lock set).
+        - First lock: blocking acquire (with remaining timeout).
+        - Rest: try-lock (acquire(blocking=False)). If one is busy, release everything held,
+          back off (exponential, randomized) and start again from the first lock.
+          Ordering alone is deadlock free; try-lock + backoff additionally stops a thread from
+          sitting on half of a lock set while it waits for the rest, which would block every
+          other thread needing only that half.
+        - Returns False on timeout (like Lock.acquire), locked() raises TimeoutError.
+    - release(*locks): in reverse order.
+
+    - Metrics per lock (only updated by the thread holding that lock, so no extra lock):
+        - acquisitions, contended (some lock of the set was busy), backoffs (times the set
+          was released and retried), wait_total / wait_max, hold_total / hold_max.
+        - Wait = time from acquire() call until whole set is held, charged to every lock of
+          the set. Hold = time from the set being held until release.
+        - report(): list of dicts sorted by total wait, hottest lock first.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ManagedLock:
+    def __init__(self, lock_id, name):
+        self.lock_id = lock_id
+        self.name = name
+        self.lock = threading.Lock()
+        self.acquired_at = None
+
+        self.acquisitions = 0
+        self.contended = 0
+        self.backoffs = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.hold_total = 0.0
+        self.hold_max = 0.0
+
+    def __repr__(self):
+        return f"ManagedLock({self.lock_id}, {self.name!r})"
+
+
+class MultiLockManager:
+    def __init__(self, backoff_min=0.00001, backoff_max=0.001):
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.locks = []
+        self.registry_lock = threading.Lock()
+
+    def new_lock(self, name=None):
+        with self.registry_lock:
+            lock = ManagedLock(len(self.locks), name or f"lock-{len(self.locks)}")
+            self.locks.append(lock)
+        return lock
+
+    def acquire(self, *locks, timeout=None):
+        ordered = sorted(set(locks), key=lambda lock: lock.lock_id)
+        if not ordered:
+            return True
+
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        backoff = self.backoff_min
+        contended = False
+        backoffs = 0
+
+        while True:
+            first = ordered[0]
+            if not first.lock.acquire(blocking=False):
+                contended = True
+                remaining = -1 if deadline is None else max(0, deadline - time.monotonic())
+                if not first.lock.acquire(timeout=remaining):
+                    return False
+
+            held = [first]
+            busy = None
+            for lock in ordered[1:]:
+                if not lock.lock.acquire(blocking=False):
+                    busy = lock
+                    break
+                held.append(lock)
+
+            if busy is None:
+                break
+
+            contended = True
+            backoffs += 1
+            for lock in reversed(held):
+                lock.lock.release()
+
+            if deadline is not None and time.monotonic() + backoff > deadline:
+                return False
+            time.sleep(random.uniform(0, backoff))
+            backoff = min(backoff * 2, self.backoff_max)
+
+        now = time.monotonic()
+        waited = now - start
+        for lock in ordered:
+            lock.acquisitions += 1
+            lock.contended += contended
+            lock.backoffs += backoffs
+            lock.wait_total += waited
+            lock.wait_max = max(lock.wait_max, waited)
+            lock.acquired_at = now
+        return True
+
+    def release(self, *locks):
+        now = time.monotonic()
+        for lock in sorted(set(locks), key=lambda lock: lock.lock_id, reverse=True):
+            held_for = now - lock.acquired_at
+            lock.hold_total += held_for
+            lock.hold_max = max(lock.hold_max, held_for)
+            lock.acquired_at = None
+            lock.lock.release()
+
+    @contextmanager
+    def locked(self, *locks, timeout=None):
+        if not self.acquire(*locks, timeout=timeout):
+            raise TimeoutError(f"Unable to acquire {len(locks)} locks within {timeout} seconds")
+        try:
+            yield
+        finally:
+            self.release(*locks)
+
+    def report(self):
+        rows = []
+        for lock in self.locks:
+            rows.append({
+                "name": lock.name,
+                "acquisitions": lock.acquisitions,
+                "contended": lock.contended,
+                "backoffs": lock.backoffs,
+                "wait_total_ms": round(lock.wait_total * 1e3, 3),
+                "wait_max_ms": round(lock.wait_max * 1e3, 3),
+                "hold_total_ms": round(lock.hold_total * 1e3, 3),
+                "hold_max_ms": round(lock.hold_max * 1e3, 3),
+            })
+        return sorted(rows, key=lambda row: row["wait_total_ms"], reverse=True)
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    # Move balance between random pairs of shards, one fine grained lock per shard vs one
+    # coarse lock for all. Total balance must be unchanged.
+    num_shards, num_threads, transfers = 16, 8, 2000
+
+    def run(fine_grained):
+        manager = MultiLockManager()
+        coarse = manager.new_lock("coarse")
+        shard_locks = [manager.new_lock(f"shard-{i}") for i in range(num_shards)]
+        balances = [1000] * num_shards
+
+        def worker(seed):
+            rng = random.Random(seed)
+            for _ in range(transfers):
+                src, dst = rng.sample(range(num_shards), 2)
+                locks = (shard_locks[dst], shard_locks[src]) if fine_grained else (coarse,)
+                with manager.locked(*locks):
+                    amount = rng.randint(1, 10)
+                    balances[src] -= amount
+                    time.sleep(0.00005)
+                    balances[dst] += amount
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+        start = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - start
+
+        name = "fine grained" if fine_grained else "coarse"
+        print(f"{name}: {num_threads * transfers / elapsed:.0f} transfers/sec, total balance: {sum(balances)}")
+        for row in [row for row in manager.report() if row["acquisitions"]][:3]:
+            print(f"    {row}")
+
+    run(fine_grained=False)
+    run(fine_grained=True)
@@ -37,6 +37,7 @@ Approach:
 Note:
     - Below doesn't check if url already visited -- need to improve check v2.
     - Also, only parse same domain name urls (This check is also not implemented.)
+    - Both are fixed in multithreaded_webcrawler_v2.py.
 """
 import threading
 import time
@@ -98,14 +99,15 @@ class WebCrawler:
                 print(f"Unable to process url: {url_to_traverse} present in domain.")
             
             
-# Set start url to a web crawler.
-wc = WebCrawler()
-wc.set_start_url("https://this-is-start-url/")
+if __name__ == "__main__":
+    # Set start url to a web crawler.
+    wc = WebCrawler()
+    wc.set_start_url("https://this-is-start-url/")
 
-threads = [threading.Thread(target=wc.crawl) for _ in range(3)]
+    threads = [threading.Thread(target=wc.crawl) for _ in range(3)]
 
-for thread in threads:
-    thread.start()
+    for thread in threads:
+        thread.start()
 
-for thread in threads:
-    thread.join()
+    for thread in threads:
+        thread.join()
@@ -0,0 +1,357 @@
+"""
+Follow-ups on multithreaded_webcrawler.py (v1):
+
+    - v1 appends every popped url to visited_urls without checking it, so duplicates are
+      fetched again and the frontier keeps growing with urls we have already seen.
+    - v1 never filters by domain of startUrl.
+    - For very large crawls (hundreds of millions of urls) keeping a python str per visited
+      url does not fit in RAM.
+
+Approach:
+    - normalize_url(url, base):
+        - Resolve relative links against the page they were found on.
+        - Lowercase scheme and host, drop default port (:80 / :443), drop #fragment,
+          empty path --> "/".
+        - Query string is kept as-is (reordering params can change meaning for some sites).
+
+    - Dedup once at enqueue time (not at pop time):
+        - with visited_lock: if visited.add(url) is True --> url is new, push to urls_to_visit.
+        - check + insert happens under the same lock, so two threads finding the same link
+          can never both enqueue it. Every url enters the frontier at most once, so frontier
+          size is bounded by number of unique urls in the domain.
+
+    - Same domain filter: hostname of normalized url must match hostname of startUrl.
+
+    - Visited set strategies (all expose add(url) -> bool, True if url was not seen before):
+        - UrlSet: exact, python set of str. Fine for small/medium crawls.
+        - HashedUrlSet: 64-bit blake2b hashes instead of strings, packed in an open
+          addressing table over array('Q') (no python object per url).
+            - ~11-23 bytes per url depending on table load (~150 bytes per url for UrlSet
+              with ~60 char urls, tracemalloc over 200k urls). Still ~2GB at 100M urls.
+            - Probability of any collision ~ n^2 / 2^65 (about 0.3% at 100M urls). A collision
+              means one url is skipped, never fetched twice.
+        - ScalableBloomFilter: list of bloom filters (bit arrays), new filter added with
+          2x capacity and tighter error rate once the current one is full.
+            - ~1.2 bytes per url at 1% error, independent of url length.
+            - False positive --> url treated as visited and skipped. Filter i has error
+              rate error_rate * (1 - tightening_ratio) * tightening_ratio^i, so the total
+              (geometric sum) stays below error_rate.
+            - Only option which keeps hundreds of millions of urls within a few hundred MB.
+
+    - Termination (work counting instead of idle timeout):
+        - v1 workers exit only after waiting 3s on an empty frontier, so every crawl pays 3s
+          of dead time and a slow getUrls can make other workers quit while work is in flight.
+        - pending_work = urls queued + urls being processed, guarded by unvisited_lock.
+            - enqueue: pending_work += number of new urls.
+            - after a url is processed (its links already enqueued): pending_work -= 1.
+        - Children are counted before parent is discounted, so pending_work reaches 0 only
+          when there is nothing queued and nothing in flight. That worker does notify_all and
+          every waiting worker exits immediately.
+"""
+import hashlib
+import math
+import threading
+import time
+from array import array
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from .lock_profiler import new_condition, new_lock
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url, base=None):
+    """
+    Return canonical form of url (resolved against base if given) used as dedup key.
+    """
+    if base is not None:
+        url = urljoin(base, url)
+
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    netloc = host
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if parts.username:
+        netloc = f"{parts.username}@{netloc}"
+
+    path = parts.path or "/"
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+def get_hostname(url):
+    return (urlsplit(url).hostname or "").lower()
+
+
+class UrlSet:
+    """
+    Exact visited set, one str per url.
+    """
+    def __init__(self):
+        self.urls = set()
+
+    def add(self, url):
+        if url in self.urls:
+            return False
+        self.urls.add(url)
+        return True
+
+    def __contains__(self, url):
+        return url in self.urls
+
+    def __len__(self):
+        return len(self.urls)
+
+
+class HashedUrlSet:
+    """
+    Visited set storing 64-bit hash of url instead of url itself, in an open addressing
+    table (linear probing) packed in array('Q'). Slot value 0 means empty.
+    """
+    def __init__(self, initial_capacity=1024, max_load=0.7):
+        capacity = 1 << max(3, (initial_capacity - 1).bit_length())
+        self.slots = array("Q", bytes(8 * capacity))
+        self.mask = capacity - 1
+        self.max_load = max_load
+        self.count = 0
+
+    @staticmethod
+    def _hash(url):
+        url_hash = int.from_bytes(hashlib.blake2b(url.encode(), digest_size=8).digest(), "little")
+        return url_hash or 1
+
+    def _find_slot(self, url_hash):
+        index = url_hash & self.mask
+        while self.slots[index] and self.slots[index] != url_hash:
+            index = (index + 1) & self.mask
+        return index
+
+    def _grow(self):
+        old_slots = self.slots
+        self.slots = array("Q", bytes(16 * len(old_slots)))
+        self.mask = len(self.slots) - 1
+        for url_hash in old_slots:
+            if url_hash:
+                self.slots[self._find_slot(url_hash)] = url_hash
+
+    def add(self, url):
+        url_hash = self._hash(url)
+        index = self._find_slot(url_hash)
+        if self.slots[index] == url_hash:
+            return False
+        self.slots[index] = url_hash
+        self.count += 1
+        if self.count > self.max_load * len(self.slots):
+            self._grow()
+        return True
+
+    def __contains__(self, url):
+        url_hash = self._hash(url)
+        return self.slots[self._find_slot(url_hash)] == url_hash
+
+    def __len__(self):
+        return self.count
+
+
+class BloomFilter:
+    """
+    Fixed capacity bloom filter over a bytearray.
+        - bits (m) = -n * ln(p) / ln(2)^2
+        - hash functions (k) = m / n * ln(2)
+        - k positions derived from 2 base hashes (double hashing): h1 + i * h2
+    """
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, url):
+        digest = hashlib.blake2b(url.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, url):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(url))
+
+    def add(self, url):
+        """
+        Set bits for url. Returns False if all bits were already set (url probably seen).
+        """
+        added = False
+        for pos in self._positions(url):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def is_full(self):
+        return self.count >= self.capacity
+
+
+class ScalableBloomFilter:
+    """
+    Grows by adding bloom filters with growth_factor x capacity and
+    tightening_ratio x error rate of the previous one.
+    """
+    def __init__(self, initial_capacity=1_000_000, error_rate=0.001, growth_factor=2, tightening_ratio=0.5):
+        self.error_rate = error_rate
+        self.growth_factor = growth_factor
+        self.tightening_ratio = tightening_ratio
+        self.filters = [BloomFilter(initial_capacity, error_rate * (1 - tightening_ratio))]
+
+    def add(self, url):
+        if url in self:
+            return False
+
+        current = self.filters[-1]
+        if current.is_full():
+            current = BloomFilter(current.capacity * self.growth_factor,
+                                  current.error_rate * self.tightening_ratio)
+            self.filters.append(current)
+        current.add(url)
+        return True
+
+    def __contains__(self, url):
+        return any(url in bloom for bloom in self.filters)
+
+    def __len__(self):
+        return sum(bloom.count for bloom in self.filters)
+
+
+class HtmlParser:
+    """
+    Fake parser over in-memory link graph {url: [linked urls]}, so crawl can run offline.
+    """
+    def __init__(self, graph, latency=0.0):
+        self.graph = graph
+        self.latency = latency
+
+    def getUrls(self, url: str) -> list[str]:
+        """
+        Returns all urls linked from the given URL
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        return list(self.graph.get(url, []))
+
+
+class WebCrawler:
+    def __init__(self, htmlParser, visited_urls=None, urls_to_visit=None, on_crawled=None, profiler=None):
+        self.start_url = None
+        self.start_host = None
+        self.urls_to_visit = urls_to_visit if urls_to_visit is not None else []
+        self.visited_urls = visited_urls if visited_urls is not None else UrlSet()
+        # on_crawled(url) streams results instead of keeping them all in crawled_urls.
+        self.on_crawled = on_crawled
+        self.crawled_urls = []
+        self.pending_work = 0
+        # profiler: optional LockProfiler (lock_profiler.py) to record contention.
+        self.visited_lock = new_lock("WebCrawler.visited_lock", profiler)
+        self.unvisited_lock = new_lock("WebCrawler.unvisited_lock", profiler)
+        self.htmlParser = htmlParser
+        self.url_available = new_condition(self.unvisited_lock, "WebCrawler.url_available", profiler)
+
+    def set_start_url(self, startURL):
+        print(f"Setting start-url with: {startURL}")
+        self.start_url = normalize_url(startURL)
+        self.start_host = get_hostname(self.start_url)
+        self.enqueue_urls([self.start_url])
+
+    def enqueue_urls(self, urls, base=None):
+        """
+        Normalize, filter by domain and push only urls never seen before.
+        """
+        new_urls = []
+        with self.visited_lock:
+            for url in urls:
+                try:
+                    url = normalize_url(url, base)
+                except ValueError:
+                    continue
+                if not self.should_crawl(url):
+                    continue
+                if self.visited_urls.add(url):
+                    new_urls.append(url)
+
+        if new_urls:
+            with self.unvisited_lock:
+                self.urls_to_visit.extend(new_urls)
+                self.pending_work += len(new_urls)
+                self.url_available.notify_all()
+        return new_urls
+
+    def should_crawl(self, url):
+        return get_hostname(url) == self.start_host
+
+    def crawl(self):
+        while True:
+            with self.unvisited_lock:
+                while len(self.urls_to_visit) == 0 and self.pending_work > 0:
+                    self.url_available.wait()
+
+                if self.pending_work == 0:
+                    return
+
+                url_to_traverse = self.urls_to_visit.pop()
+
+            self.process_url(url_to_traverse)
+
+    def record_crawled(self, url):
+        if self.on_crawled is not None:
+            self.on_crawled(url)
+        else:
+            self.crawled_urls.append(url)
+
+    def process_url(self, url_to_traverse):
+        self.record_crawled(url_to_traverse)
+        try:
+            urls = self.htmlParser.getUrls(url_to_traverse)
+            self.enqueue_urls(urls, base=url_to_traverse)
+        except Exception as e:
+            print(f"Unable to process url: {url_to_traverse}, error: {e}")
+        finally:
+            self.finish_work()
+
+    def finish_work(self):
+        with self.unvisited_lock:
+            self.pending_work -= 1
+            if self.pending_work == 0:
+                # Nothing queued and nothing in flight, wake everyone up to exit.
+                self.url_available.notify_all()
+
+
+def crawl(startUrl, htmlParser, num_threads=3, visited_urls=None, profiler=None):
+    wc = WebCrawler(htmlParser, visited_urls, profiler=profiler)
+    wc.set_start_url(startUrl)
+
+    threads = [threading.Thread(target=wc.crawl) for _ in range(num_threads)]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    return wc.crawled_urls
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    graph = {
+        "http://news.example.com/": ["/a", "/b", "http://news.example.com:80/a#comments", "http://other.com/x"],
+        "http://news.example.com/a": ["../b", "/c", "http://NEWS.example.com/"],
+        "http://news.example.com/b": ["/a", "/c"],
+        "http://news.example.com/c": ["https://news.example.com/secure", "/a"],
+    }
+    parser = HtmlParser(graph, latency=0.1)
+
+    for visited in [UrlSet(), HashedUrlSet(), ScalableBloomFilter(initial_capacity=2)]:
+        urls = crawl("http://news.example.com", parser, visited_urls=visited)
+        print(f"{type(visited).__name__}: crawled {len(urls)} urls: {sorted(urls)}")
@@ -0,0 +1,181 @@
+"""
+Problem Statement:
+    - Simulation steps loop over elements in Python. With the phase/barrier structure of
+      EarlyStopSimulation / PhaseEngine, phases should instead run over one large shared NumPy
+      array:
+        - Array split into one chunk per worker, each worker runs a vectorized kernel on its
+          chunk in place (a view, no copy).
+        - A reduction (sum, max, ...) of the per-worker partial results at every barrier.
+    - Scales across cores for kernels that release the GIL (most NumPy ufuncs on large chunks)
+      with the thread backend, and for everything with the process backend.
+
+Approach:
+    - Built on PhaseEngine (phase_engine.py), so backends, barrier action and cancellation are
+      the same.
+    - Data lives in multiprocessing.shared_memory for both backends:
+        - data: the array, copied in once at start.
+        - partials: float64[num_workers], one slot per worker, no lock needed.
+        - results: float64[num_phases], reduced value of every phase.
+      Workers attach by name (cached per process), so process workers see the same memory.
+    - Worker w owns rows [n * w // W, n * (w + 1) // W) of axis 0 for every phase.
+    - ChunkKernelPhase (a PhaseEngine phase): partial = kernel(chunk), kernel modifies chunk
+      in place and returns a scalar (or None).
+    - BarrierReduction (PhaseEngine's should_stop, i.e. runs in the barrier action in one
+      worker while the rest wait): results[phase] = reducer(partials), then
+      stop_when(phase, value) can end the run early (e.g. on convergence).
+    - Kernels / reducers / stop_when must be picklable (module level) for the process backend.
+    - Caller owns the engine: close() (or with block) releases the shared memory.
+"""
+import time
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .phase_engine import PhaseEngine
+
+_attached = {}
+
+
+def _attach(name, shape, dtype):
+    # Keep SharedMemory object referenced as long as the process may use the array.
+    shm = _attached.get(name)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=name)
+        _attached[name] = shm
+    return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+class SharedArraySpec:
+    """
+    Picklable handle (name, shape, dtype) to an array in shared memory.
+    """
+    def __init__(self, shm, shape, dtype):
+        self.name = shm.name
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype).str
+
+    def array(self):
+        return _attach(self.name, self.shape, self.dtype)
+
+
+class ChunkKernelPhase:
+    def __init__(self, data, partials, kernel):
+        self.data = data
+        self.partials = partials
+        self.kernel = kernel
+
+    def __call__(self, worker_id, num_workers, cancelled):
+        data = self.data.array()
+        rows = data.shape[0]
+        chunk = data[rows * worker_id // num_workers: rows * (worker_id + 1) // num_workers]
+        partial = self.kernel(chunk)
+        self.partials.array()[worker_id] = 0.0 if partial is None else partial
+
+
+class BarrierReduction:
+    def __init__(self, partials, results, reducers, stop_when=None):
+        self.partials = partials
+        self.results = results
+        self.reducers = reducers
+        self.stop_when = stop_when
+
+    def __call__(self, phases_completed):
+        phase = phases_completed - 1
+        value = float(self.reducers[phase](self.partials.array()))
+        self.results.array()[phase] = value
+        return self.stop_when is not None and self.stop_when(phase, value)
+
+
+class ChunkedArrayEngine:
+    def __init__(self, data, kernels, num_workers=4, backend="thread", stop_when=None):
+        """
+        kernels: list of (kernel, reducer) pairs, one per phase. reducer gets the float64
+        array of per-worker partials, e.g. np.sum / np.max.
+        """
+        if np is None:
+            raise ImportError("ChunkedArrayEngine requires numpy (pip install numpy)")
+        data = np.asarray(data)
+        self.num_phases = len(kernels)
+
+        self.segments = []
+        self.data = self._allocate(data.shape, data.dtype)
+        self.data.array()[...] = data
+        self.partials = self._allocate((num_workers,), np.float64)
+        self.results = self._allocate((self.num_phases,), np.float64)
+        self.results.array()[:] = np.nan
+
+        phases = [ChunkKernelPhase(self.data, self.partials, kernel) for kernel, _ in kernels]
+        reduction = BarrierReduction(self.partials, self.results, [reducer for _, reducer in kernels], stop_when)
+        self.engine = PhaseEngine(phases, num_workers=num_workers, backend=backend, should_stop=reduction)
+
+    def _allocate(self, shape, dtype):
+        size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        self.segments.append(shm)
+        return SharedArraySpec(shm, shape, dtype)
+
+    @property
+    def array(self):
+        return self.data.array()
+
+    def run(self, timeout=None):
+        summary = self.engine.run(timeout)
+        summary["results"] = self.results.array()[:summary["phases_completed"]].tolist()
+        return summary
+
+    def cancel(self):
+        self.engine.cancel()
+
+    def close(self):
+        for shm in self.segments:
+            _attached.pop(shm.name, None)
+            shm.close()
+            shm.unlink()
+        self.segments = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+###### TESTING #########
+
+def relax(chunk):
+    # x = 0.5 * x + 1 in place, converges to 2. Returns sum of squared change.
+    delta = chunk * -0.5 + 1.0
+    chunk += delta
+    return float(np.dot(delta, delta))
+
+
+def chunk_max(chunk):
+    return float(chunk.max())
+
+
+def converged(phase, value):
+    return value < 1e-6
+
+
+if __name__ == "__main__":
+    n = 5_000_000
+    kernels = [(relax, np.sum)] * 50 + [(chunk_max, np.max)]
+
+    for backend in ("thread", "process"):
+        with ChunkedArrayEngine(np.random.default_rng(0).random(n), kernels, num_workers=4, backend=backend,
+                                stop_when=converged) as engine:
+            summary = engine.run()
+            print(f"{backend}: {summary['phases_completed']} phases in {summary['elapsed']}s, converged: "
+                  f"{summary['cancelled']}, last residual: {summary['results'][-1]:.2e}, "
+                  f"array mean: {engine.array.mean():.6f}")
+
+    # Same relaxation step as a per-element Python loop, on 1% of the data.
+    values = np.random.default_rng(0).random(n // 100).tolist()
+    start = time.monotonic()
+    for i in range(len(values)):
+        values[i] += values[i] * -0.5 + 1.0
+    per_element = (time.monotonic() - start) / len(values)
+    print(f"Python loop, one phase over {n} elements would take ~{per_element * n:.2f}s")
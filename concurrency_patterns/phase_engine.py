@@ -0,0 +1,200 @@
+"""
+Problem Statement:
+    - EarlyStopSimulation (early_stop_multiphase_simulation.py) hard codes 4 threads, 3 phases
+      and one stop check after phase 2.
+    - Stop is an Event polled after the barrier: leader sets it after barrier.wait() returned,
+      so other workers may already have checked it and gone on to phase 3. And a stop raised
+      while workers run can't reach workers already blocked in barrier.wait().
+    - CPU bound phases need real cores (processes, not threads) and fast shutdown.
+
+Approach:
+    - PhaseEngine(phases, num_workers, backend="thread" | "process", should_stop=None)
+        - phases: list of phase(worker_id, num_workers, cancelled) callables, run by every
+          worker in order with a barrier after each one. cancelled is the engine's Event, long
+          phases can poll it to exit early.
+        - Same code for both backends, primitives come from threading or from a multiprocessing
+          context (Barrier, Event, Value).
+    - Stop decision in the barrier action:
+        - Barrier(num_workers, action=PhaseAction) runs the action in exactly one worker after
+          all arrived and before any is released. Action counts completed phases and calls
+          should_stop(phases_completed); if True it sets cancelled.
+        - So every worker sees the same decision right after the barrier (no leader race).
+    - Cancellation (cancel() from any thread, or run(timeout)):
+        - cancelled.set() + barrier.abort(). Every worker blocked in barrier.wait() gets
+          BrokenBarrierError at once, and workers still in a phase get it on their next wait.
+        - Process backend: workers still alive after grace seconds are terminated.
+    - Failure: a phase (or should_stop) raising in a worker aborts the barrier like cancel(),
+      so the other workers don't wait for it forever. The worker puts (worker_id, phase index,
+      exception) on an errors queue and run() raises PhaseError chained to the first one,
+      instead of reporting a plain cancel.
+    - Process backend needs picklable phases / should_stop (module level functions).
+"""
+import multiprocessing
+import queue
+import threading
+import time
+
+BACKENDS = ("thread", "process")
+
+
+class PhaseAction:
+    def __init__(self, phases_completed, cancelled, should_stop):
+        self.phases_completed = phases_completed
+        self.cancelled = cancelled
+        self.should_stop = should_stop
+
+    def __call__(self):
+        self.phases_completed.value += 1
+        if self.should_stop is not None and self.should_stop(self.phases_completed.value):
+            self.cancelled.set()
+
+
+class PhaseError(Exception):
+    def __init__(self, worker_id, phase_index, message):
+        super().__init__(message)
+        self.worker_id = worker_id
+        self.phase_index = phase_index
+
+
+def run_worker(worker_id, num_workers, phases, barrier, cancelled, errors):
+    for index, phase in enumerate(phases):
+        if cancelled.is_set():
+            return
+        try:
+            phase(worker_id, num_workers, cancelled)
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            return
+        except Exception as e:
+            try:
+                errors.put((worker_id, index, e))
+            except Exception:
+                errors.put((worker_id, index, RuntimeError(repr(e))))  # not picklable
+            cancelled.set()
+            barrier.abort()
+            return
+
+
+class Counter:
+    """
+    Thread backend stand-in for multiprocessing.Value.
+    """
+    def __init__(self):
+        self.value = 0
+
+
+class PhaseEngine:
+    def __init__(self, phases, num_workers=4, backend="thread", should_stop=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        self.phases = list(phases)
+        self.num_workers = num_workers
+        self.backend = backend
+
+        if backend == "thread":
+            self.cancelled = threading.Event()
+            self.phases_completed = Counter()
+            self.errors = queue.SimpleQueue()
+            barrier_type, self.worker_type = threading.Barrier, threading.Thread
+        else:
+            context = multiprocessing.get_context()
+            self.cancelled = context.Event()
+            self.phases_completed = context.Value("i", 0)
+            self.errors = context.SimpleQueue()
+            barrier_type, self.worker_type = context.Barrier, context.Process
+
+        action = PhaseAction(self.phases_completed, self.cancelled, should_stop)
+        self.barrier = barrier_type(num_workers, action=action)
+        self.workers = []
+
+    def cancel(self):
+        self.cancelled.set()
+        self.barrier.abort()
+
+    def run(self, timeout=None, grace=1.0):
+        """
+        Runs all phases, returns summary dict. Raises PhaseError if a phase raised.
+        """
+        start = time.monotonic()
+        self.workers = [
+            self.worker_type(target=run_worker, args=(i, self.num_workers, self.phases, self.barrier, self.cancelled,
+                                                       self.errors))
+            for i in range(self.num_workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+        deadline = None if timeout is None else start + timeout
+        for worker in self.workers:
+            worker.join(None if deadline is None else max(0, deadline - time.monotonic()))
+
+        if any(worker.is_alive() for worker in self.workers):
+            self.cancel()
+            grace_deadline = time.monotonic() + grace
+            for worker in self.workers:
+                worker.join(max(0, grace_deadline - time.monotonic()))
+            if self.backend == "process":
+                for worker in self.workers:
+                    if worker.is_alive():
+                        worker.terminate()
+                        worker.join()
+
+        errors = []
+        while not self.errors.empty():
+            errors.append(self.errors.get())
+        if errors:
+            worker_id, index, error = min(errors, key=lambda e: (e[1], e[0]))
+            raise PhaseError(worker_id, index, f"Phase {index} failed in worker {worker_id} "
+                                               f"({len(errors)} worker(s) failed): {error!r}") from error
+
+        return {
+            "phases_completed": self.phases_completed.value,
+            "cancelled": self.cancelled.is_set(),
+            "elapsed": round(time.monotonic() - start, 3),
+        }
+
+
+###### TESTING #########
+
+def cpu_phase(worker_id, num_workers, cancelled):
+    total = 0
+    for i in range(2_000_000):
+        total += i * i
+    return total
+
+
+def cancellable_phase(worker_id, num_workers, cancelled):
+    # Worker 0 is slow, but polls cancelled, everyone else reaches the barrier quickly.
+    end = time.monotonic() + (30 if worker_id == 0 else 0.01)
+    while time.monotonic() < end and not cancelled.is_set():
+        time.sleep(0.01)
+
+
+def stop_after_two(phases_completed):
+    return phases_completed == 2
+
+
+def failing_phase(worker_id, num_workers, cancelled):
+    if worker_id == 1:
+        raise ValueError("bad input chunk")
+
+
+if __name__ == "__main__":
+    for backend in BACKENDS:
+        engine = PhaseEngine([cpu_phase] * 3, num_workers=4, backend=backend)
+        print(f"{backend}: 3 cpu phases x 4 workers: {engine.run()}")
+
+        engine = PhaseEngine([cpu_phase] * 5, num_workers=4, backend=backend, should_stop=stop_after_two)
+        print(f"{backend}: should_stop after phase 2: {engine.run()}")
+
+        # Cancel from outside while 3 workers wait at the barrier and one is still working.
+        engine = PhaseEngine([cancellable_phase] * 3, num_workers=4, backend=backend)
+        threading.Timer(0.2, engine.cancel).start()
+        print(f"{backend}: cancelled mid phase: {engine.run()}")
+
+        # One worker raising aborts the others instead of leaving them at the barrier.
+        engine = PhaseEngine([cpu_phase, failing_phase, cpu_phase], num_workers=4, backend=backend)
+        try:
+            engine.run()
+        except PhaseError as e:
+            print(f"{backend}: {e}")
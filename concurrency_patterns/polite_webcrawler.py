@@ -0,0 +1,207 @@
+"""
+Problem Statement:
+    - Crawler following links beyond one domain must be polite: each host has its own rate
+      limit (pages/sec) that we must never exceed.
+    - With a single LIFO frontier (urls_to_visit.pop()) workers keep picking urls of whichever
+      host is being throttled and stall behind it, so throughput is set by the slowest host.
+    - Goal: total pages/sec should approach sum of per-host limits.
+
+Approach:
+    - TokenBucket per host:
+        - rate (tokens/sec) and burst (max tokens).
+        - ready_time(now): when next token will be available.
+
+    - PerHostFrontier (replaces the urls_to_visit list):
+        - host_queues: host -> deque of urls (FIFO within a host).
+        - ready_heap: (ready_time, seq, host) for every host with a non-empty queue.
+          A host is in the heap at most once.
+        - pop_ready(now):
+            - Top of heap is the host that becomes eligible first.
+            - If ready_time <= now: consume a token, pop url from its queue and push host back
+              with its new ready_time (if more urls queued).
+            - Else: nothing eligible, return how long to wait until top of heap is ready.
+        - Not thread safe by itself, guarded by crawler's unvisited_lock (same as the list).
+        - Idle buckets are evicted, so memory doesn't grow with every host ever seen:
+            - When a host queue becomes empty, (time its bucket is full again, host) is pushed
+              to idle_heap.
+            - On every append/pop, hosts whose full time has passed and which are still idle
+              lose their bucket. A recreated bucket starts full, same as the evicted one was.
+
+    - PoliteWebCrawler(WebCrawler from v2):
+        - Same dedup + work counting termination.
+        - Worker waits on url_available with timeout = time until next host is eligible,
+          so it is woken either by new urls or when a throttled host becomes ready.
+        - allowed_hosts: None means follow links to any host.
+
+Note:
+    - Throughput ~= min(sum of host rates, num_threads / fetch latency). Add threads until
+      the first term is the limit.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+from .multithreaded_webcrawler_v2 import HtmlParser, WebCrawler, get_hostname
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.last_refill = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def full_time(self, now):
+        self._refill(now)
+        return now + (self.capacity - self.tokens) / self.rate
+
+    def ready_time(self, now):
+        self._refill(now)
+        if self.tokens >= 1:
+            return now
+        return now + (1 - self.tokens) / self.rate
+
+    def consume(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class PerHostFrontier:
+    def __init__(self, default_rate=1.0, burst=1, host_rates=None):
+        self.default_rate = default_rate
+        self.burst = burst
+        self.host_rates = host_rates or {}
+        self.host_queues = {}
+        self.buckets = {}
+        self.ready_heap = []
+        self.idle_heap = []
+        self.seq = itertools.count()
+        self.size = 0
+
+    def _bucket(self, host):
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.host_rates.get(host, self.default_rate), self.burst)
+        return self.buckets[host]
+
+    def _schedule(self, host, now):
+        heapq.heappush(self.ready_heap, (self._bucket(host).ready_time(now), next(self.seq), host))
+
+    def _evict_idle_buckets(self, now):
+        while self.idle_heap and self.idle_heap[0][0] <= now:
+            _, host = heapq.heappop(self.idle_heap)
+            bucket = self.buckets.get(host)
+            if host not in self.host_queues and bucket is not None and bucket.full_time(now) <= now:
+                del self.buckets[host]
+
+    def append(self, url):
+        host = get_hostname(url)
+        queue = self.host_queues.setdefault(host, deque())
+        queue.append(url)
+        self.size += 1
+        if len(queue) == 1:
+            # Host had nothing queued, so it is not in the heap yet.
+            now = time.monotonic()
+            self._evict_idle_buckets(now)
+            self._schedule(host, now)
+
+    def extend(self, urls):
+        for url in urls:
+            self.append(url)
+
+    def pop_ready(self, now=None):
+        """
+        Returns (url, None) if some host is eligible now, else (None, seconds to wait).
+        (None, None) if frontier is empty.
+        """
+        if not self.ready_heap:
+            return None, None
+
+        now = time.monotonic() if now is None else now
+        ready_time, _, host = self.ready_heap[0]
+        if ready_time > now:
+            return None, ready_time - now
+
+        heapq.heappop(self.ready_heap)
+        self.buckets[host].consume(now)
+        queue = self.host_queues[host]
+        url = queue.popleft()
+        self.size -= 1
+        if queue:
+            self._schedule(host, now)
+        else:
+            del self.host_queues[host]
+            heapq.heappush(self.idle_heap, (self.buckets[host].full_time(now), host))
+        self._evict_idle_buckets(now)
+        return url, None
+
+    def __len__(self):
+        return self.size
+
+
+class PoliteWebCrawler(WebCrawler):
+    def __init__(self, htmlParser, visited_urls=None, default_rate=1.0, burst=1, host_rates=None, allowed_hosts=None,
+                 profiler=None):
+        super().__init__(htmlParser, visited_urls, profiler=profiler)
+        self.urls_to_visit = PerHostFrontier(default_rate, burst, host_rates)
+        self.allowed_hosts = allowed_hosts
+
+    def should_crawl(self, url):
+        return self.allowed_hosts is None or get_hostname(url) in self.allowed_hosts
+
+    def crawl(self):
+        while True:
+            with self.unvisited_lock:
+                while True:
+                    if self.pending_work == 0:
+                        return
+
+                    url_to_traverse, wait_time = self.urls_to_visit.pop_ready()
+                    if url_to_traverse is not None:
+                        break
+                    # Woken by new urls, or when the earliest throttled host becomes eligible.
+                    self.url_available.wait(wait_time)
+
+            self.process_url(url_to_traverse)
+
+
+def polite_crawl(startUrl, htmlParser, num_threads=8, **kwargs):
+    wc = PoliteWebCrawler(htmlParser, **kwargs)
+    wc.set_start_url(startUrl)
+
+    threads = [threading.Thread(target=wc.crawl) for _ in range(num_threads)]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    return wc.crawled_urls
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    # Pages per host proportional to its rate limit, each page links to next page of its
+    # own host and to first page of every other host. Ideal crawl time ~ 2s for all hosts.
+    host_rates = {"fast.com": 20.0, "medium.com": 10.0, "slow.com": 2.0}
+    graph = {}
+    for host, rate in host_rates.items():
+        pages = int(rate * 2)
+        for i in range(pages):
+            links = [f"http://{other}/0" for other in host_rates]
+            if i + 1 < pages:
+                links.append(f"http://{host}/{i+1}")
+            graph[f"http://{host}/{i}"] = links
+
+    parser = HtmlParser(graph, latency=0.05)
+    start = time.monotonic()
+    urls = polite_crawl("http://fast.com/0", parser, num_threads=8, host_rates=host_rates)
+    elapsed = time.monotonic() - start
+
+    print(f"Crawled {len(urls)} urls in {elapsed:.2f}s --> {len(urls) / elapsed:.1f} pages/sec "
+          f"(sum of host limits: {sum(host_rates.values())} pages/sec)")
@@ -73,16 +73,19 @@ Queries:
                         buffer.append(item)
                         self.is_empty.notify()
 """
-from threading import Condition, Lock, Thread, get_ident
+from threading import Thread, get_ident
 import time
 
+from .lock_profiler import new_condition, new_lock
+
 class BoundedBuffer:
-    def __init__(self, max_capacity=1):
+    def __init__(self, max_capacity=1, profiler=None):
+        # profiler: optional LockProfiler (lock_profiler.py) to record contention.
         self.buffer = []
         self.max_capacity = max_capacity
-        self.buffer_lock = Lock()
-        self.is_full = Condition(self.buffer_lock)
-        self.is_empty = Condition(self.buffer_lock)
+        self.buffer_lock = new_lock("BoundedBuffer.buffer_lock", profiler)
+        self.is_full = new_condition(self.buffer_lock, "BoundedBuffer.is_full", profiler)
+        self.is_empty = new_condition(self.buffer_lock, "BoundedBuffer.is_empty", profiler)
     
     def produce(self, item, producer_id):
         with self.is_full:
@@ -111,26 +114,27 @@ class BoundedBuffer:
             self.is_full.notify()
 
 
-# Testing
-bf = BoundedBuffer()
+if __name__ == "__main__":
+    # Testing
+    bf = BoundedBuffer()
 
-def produce():
-    for i in range(2):
-        bf.produce(i, get_ident())
-        print(f"After producing {i},  Buffer state: ", bf.buffer)
-        time.sleep(2)
+    def produce():
+        for i in range(2):
+            bf.produce(i, get_ident())
+            print(f"After producing {i},  Buffer state: ", bf.buffer)
+            time.sleep(2)
 
-def consume():
-    for i in range(1):
-        bf.consume(get_ident())
-        print("Buffer state after consuming: ", bf.buffer)
+    def consume():
+        for i in range(1):
+            bf.consume(get_ident())
+            print("Buffer state after consuming: ", bf.buffer)
 
-# Create 2 producer and consumer threads each for testing
-producers = [Thread(target=produce) for _ in range(2)]
-consumers = [Thread(target=consume) for _ in range(2)]
+    # Create 2 producer and consumer threads each for testing
+    producers = [Thread(target=produce) for _ in range(2)]
+    consumers = [Thread(target=consume) for _ in range(2)]
 
-for t in producers + consumers:
-    t.start()
+    for t in producers + consumers:
+        t.start()
 
-for t in producers + consumers:
-    t.join()
+    for t in producers + consumers:
+        t.join()
@@ -36,40 +36,56 @@ class ReaderWriterLock:
         self.resource_lock = threading.Lock()
         self.resource = 0
 
-    def read(self):
+    def acquire_read(self):
         with self.lock:
             self.reader_count += 1
             if self.reader_count == 1:
                 # Acquire resource_lock as well to make sure writer doesn't have 
                 # permission to write to resource
                 self.resource_lock.acquire()
-            
-        # Perform read
-        print(f"[Read] ThreadID: {threading.get_ident()}, resource value: {self.resource}")
-        time.sleep(1)
 
+    def release_read(self):
         with self.lock:
             self.reader_count -= 1
             if self.reader_count == 0:
                 # No more readers then release resource lock.
                 self.resource_lock.release()
+
+    def acquire_write(self):
+        self.resource_lock.acquire()
+
+    def release_write(self):
+        self.resource_lock.release()
+
+    def read(self):
+        self.acquire_read()
+        try:
+            # Perform read
+            print(f"[Read] ThreadID: {threading.get_ident()}, resource value: {self.resource}")
+            time.sleep(1)
+        finally:
+            self.release_read()
     
     def write(self, value):
-        with self.resource_lock:
+        self.acquire_write()
+        try:
             # Perform write
             print("Writing data to new value: ", value)
             self.resource = value
             time.sleep(2)
+        finally:
+            self.release_write()
 
-###### TESTING #########
-rw_lock = ReaderWriterLock()
+if __name__ == "__main__":
+    ###### TESTING #########
+    rw_lock = ReaderWriterLock()
 
-for _ in range(5):
-    readers = [threading.Thread(target=rw_lock.read) for _ in range(4)]
-    writers = [threading.Thread(target=rw_lock.write, args=(i,)) for i in range(1, 3)]
+    for _ in range(5):
+        readers = [threading.Thread(target=rw_lock.read) for _ in range(4)]
+        writers = [threading.Thread(target=rw_lock.write, args=(i,)) for i in range(1, 3)]
 
-    for t in writers + readers:
-        t.start()
+        for t in writers + readers:
+            t.start()
 
-    for t in  writers + readers:
-        t.join()
+        for t in  writers + readers:
+            t.join()
@@ -39,21 +39,19 @@ class WritePriorityReaderWriterLock:
         self.reader_count = 0
         self.resource = 0
 
-    def write(self, value):
+    def acquire_write(self):
         with self.writer_available:
             self.writer_available_flag = True
             self.writer_available.notify_all()  # Wake waiting readers so they re-check the flag
+        self.resource_lock.acquire()
 
-        with self.resource_lock:
-            print(f"[Write] Thread {threading.get_ident()} updating value to {value}")
-            self.resource = value
-            time.sleep(2)
-
+    def release_write(self):
+        self.resource_lock.release()
         with self.writer_available:
             self.writer_available_flag = False
             self.writer_available.notify_all()
 
-    def read(self):
+    def acquire_read(self):
         with self.read_lock:
             with self.writer_available:
                 while self.writer_available_flag:
@@ -63,10 +61,25 @@ class WritePriorityReaderWriterLock:
             if self.reader_count == 1:
                 self.resource_lock.acquire()
 
-        print(f"[Read] Thread {threading.get_ident()} reading value: {self.resource}")
-        time.sleep(1)
-
+    def release_read(self):
         with self.read_lock:
             self.reader_count -= 1
             if self.reader_count == 0:
                 self.resource_lock.release()
+
+    def write(self, value):
+        self.acquire_write()
+        try:
+            print(f"[Write] Thread {threading.get_ident()} updating value to {value}")
+            self.resource = value
+            time.sleep(2)
+        finally:
+            self.release_write()
+
+    def read(self):
+        self.acquire_read()
+        try:
+            print(f"[Read] Thread {threading.get_ident()} reading value: {self.resource}")
+            time.sleep(1)
+        finally:
+            self.release_read()
@@ -0,0 +1,206 @@
+"""
+Problem Statement:
+    - SmokingTable.put_ingredients (cigarette_smokers_problem.py) calls notify_all on every put,
+      so every Smoker wakes up, re-checks the table and most go back to sleep. Agent never waits
+      for anyone to take the ingredients.
+    - Same pattern pairs jobs with licence and GPU slot tokens, where the herd of useless
+      wakeups limits throughput.
+    - Add a dispatcher which:
+        - Matches available resources to registered consumers, each needing a set of resources
+          (resource type --> count).
+        - Wakes only a waiter that can actually proceed (per consumer condition).
+        - Supports many consumers and resource types.
+        - Backpressure: producers block while their resource type is at capacity.
+
+Approach:
+    - One lock. All conditions are created on it:
+        - One Condition per waiting consumer (Waiter), so a notify reaches exactly that thread.
+        - One Condition per resource type for producers waiting for space.
+    - available: resource --> tokens currently free. capacity: resource --> max free tokens.
+    - Consumer.acquire(timeout):
+        - If nobody waiting needs any of the same resources and requirements are satisfiable,
+          take the tokens and return.
+        - Else enqueue a Waiter and dispatch the waiters sharing its resources in arrival
+          order (ones ahead get first pick, it may be granted right away), then wait on its own
+          condition until granted.
+    - put_many({resource: count}) / put(resource, count) (producer):
+        - While some resource would exceed capacity, wait on that resource's condition.
+        - Add all tokens at once, then _dispatch(resources): scan waiters in arrival order
+          which need any of them, and for each one whose full set is now available deduct the tokens on its
+          behalf (hand-off), mark granted and notify its condition. Waiters not needing the
+          resource are not even looked at.
+        - Tokens handed out free capacity --> notify producers of those resource types.
+    - Hand-off means a woken consumer never finds its tokens gone (no spurious wakeups), and a
+      later arrival can't barge past a waiter whose set is complete.
+    - A waiter whose set is not complete doesn't block later waiters which can be served
+      (no head of line blocking). A consumer needing a large set can be overtaken by smaller
+      ones; fine for token pools where every consumer needs a few tokens.
+    - stats: grants, consumer_wakeups (always == waits that were granted), producer_waits.
+"""
+import random
+import threading
+import time
+from collections import Counter
+
+
+class Waiter:
+    def __init__(self, requirements, lock):
+        self.requirements = requirements
+        self.granted = False
+        self.turn = threading.Condition(lock)
+
+
+class Consumer:
+    def __init__(self, dispatcher, name, requirements):
+        self.dispatcher = dispatcher
+        self.name = name
+        self.requirements = dict(requirements)
+
+    def acquire(self, timeout=None):
+        return self.dispatcher.acquire(self.requirements, timeout)
+
+    def release(self):
+        """
+        Give tokens back (reusable tokens, e.g. licences / GPU slots).
+        """
+        self.dispatcher.put_many(self.requirements)
+
+
+class ResourceDispatcher:
+    def __init__(self, capacity):
+        """
+        capacity: resource type --> max number of free tokens producers may put.
+        """
+        self.capacity = dict(capacity)
+        self.available = Counter({resource: 0 for resource in self.capacity})
+        self.lock = threading.Lock()
+        self.space_available = {resource: threading.Condition(self.lock) for resource in self.capacity}
+        self.waiters = {}  # insertion ordered, used as ordered set
+        self.stats = {"grants": 0, "consumer_wakeups": 0, "producer_waits": 0}
+
+    def register(self, name, requirements):
+        unknown = set(requirements) - set(self.capacity)
+        if unknown:
+            raise KeyError(f"Unknown resources: {sorted(unknown)}")
+        return Consumer(self, name, requirements)
+
+    def _satisfiable(self, requirements):
+        return all(self.available[resource] >= count for resource, count in requirements.items())
+
+    def _take(self, requirements):
+        for resource, count in requirements.items():
+            self.available[resource] -= count
+            self.space_available[resource].notify_all()
+        self.stats["grants"] += 1
+
+    def _dispatch(self, resources):
+        for waiter in list(self.waiters):
+            if not resources.isdisjoint(waiter.requirements) and self._satisfiable(waiter.requirements):
+                self._take(waiter.requirements)
+                waiter.granted = True
+                del self.waiters[waiter]
+                waiter.turn.notify()
+
+    def acquire(self, requirements, timeout=None):
+        with self.lock:
+            # Only take directly if nobody waiting could use these tokens first.
+            competing = any(set(waiter.requirements) & set(requirements) for waiter in self.waiters)
+            if not competing and self._satisfiable(requirements):
+                self._take(requirements)
+                return True
+
+            # Queue behind competing waiters, then dispatch in arrival order: waiters ahead get
+            # first pick, and this one is served right away if tokens are left for it.
+            waiter = Waiter(requirements, self.lock)
+            self.waiters[waiter] = None
+            self._dispatch(set(requirements))
+            if waiter.granted:
+                return True
+            if not waiter.turn.wait_for(lambda: waiter.granted, timeout):
+                del self.waiters[waiter]
+                return False
+            self.stats["consumer_wakeups"] += 1
+            return True
+
+    def put(self, resource, count=1, timeout=None):
+        return self.put_many({resource: count}, timeout)
+
+    def put_many(self, resources, timeout=None):
+        """
+        Put several resource types at once: waits until all fit, adds all, then dispatches, so
+        no consumer can take part of them in between.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.lock:
+            waited = False
+            while True:
+                full = next((r for r, count in resources.items() if self.available[r] + count > self.capacity[r]), None)
+                if full is None:
+                    break
+                if not waited:
+                    self.stats["producer_waits"] += 1
+                    waited = True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.space_available[full].wait(remaining)
+
+            for resource, count in resources.items():
+                self.available[resource] += count
+            self._dispatch(set(resources))
+            return True
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    # Smokers: agent puts 2 of 3 ingredients together, capacity 1 each --> agent blocks until
+    # the previous pair was taken (any two pairs share an ingredient).
+    ingredients = ["tobacco", "paper", "matches"]
+    table = ResourceDispatcher({ingredient: 1 for ingredient in ingredients})
+    smoked = Counter()
+
+    def smoker(own):
+        consumer = table.register(own, {ingredient: 1 for ingredient in ingredients if ingredient != own})
+        while consumer.acquire(timeout=0.5):
+            smoked[own] += 1
+
+    def agent(rounds):
+        rng = random.Random(0)
+        for _ in range(rounds):
+            table.put_many({ingredient: 1 for ingredient in rng.sample(ingredients, 2)})
+
+    smokers = [threading.Thread(target=smoker, args=(own,)) for own in ingredients]
+    for t in smokers:
+        t.start()
+    agent(3000)
+    for t in smokers:
+        t.join()
+    print(f"Smokers: {dict(smoked)}, stats: {table.stats}")
+
+    # Jobs pairing GPU slots and licences: 64 worker threads, 3 job shapes.
+    pool = ResourceDispatcher({"gpu": 8, "licence": 4, "cpu": 32})
+    pool.put("gpu", 8)
+    pool.put("licence", 4)
+    pool.put("cpu", 32)
+    shapes = [{"gpu": 1, "licence": 1}, {"gpu": 2, "cpu": 4}, {"cpu": 2}]
+    jobs_done = Counter()
+    stop = threading.Event()
+
+    def worker(worker_id):
+        shape = shapes[worker_id % len(shapes)]
+        consumer = pool.register(f"worker-{worker_id}", shape)
+        while not stop.is_set():
+            if consumer.acquire(timeout=0.1):
+                time.sleep(0.001)
+                consumer.release()
+                jobs_done[worker_id % len(shapes)] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(64)]
+    for t in workers:
+        t.start()
+    time.sleep(1)
+    stop.set()
+    for t in workers:
+        t.join()
+    print(f"Jobs/sec by shape: {[jobs_done[i] for i in range(len(shapes))]}, stats: {pool.stats}, "
+          f"free: {dict(pool.available)}")
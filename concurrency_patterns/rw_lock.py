@@ -0,0 +1,201 @@
+"""
+Problem Statement:
+    - ReaderWriterLock (reader_writer_problem.py) and WritePriorityReaderWriterLock
+      (reader_writer_v2.py) are tied to their own `resource` field and a sleep, so they can't
+      guard anything else.
+    - In ReaderWriterLock, resource_lock is acquired by the first reader and released by the
+      last one, which can be a different thread (works with Lock, but not a real ownership).
+    - Need a general purpose RW lock:
+        - read_locked() / write_locked() context managers.
+        - Selectable policy: reader preferring, writer preferring, phase fair.
+        - Timeouts on acquire.
+
+Approach:
+    - No lock is handed over between threads. One Lock + one Condition guard the counters:
+        - active_readers, writer_active (+ writer_owner), waiting_writers
+        - blocked_readers, readers_admitted, write_releases (only used by phase fair)
+    - Every acquire is Condition.wait_for(can_enter, timeout), every release does notify_all.
+
+    - Policies:
+        - READER_PREFERRING: reader enters if no writer is active. Writers can starve while
+          readers keep overlapping.
+        - WRITER_PREFERRING: reader also waits while any writer is waiting (same as
+          WritePriorityReaderWriterLock). Readers can starve under continuous writes.
+        - PHASE_FAIR: read and write phases alternate.
+            - Reader arriving while a writer is active or waiting is blocked for one write phase.
+            - When that writer releases, all blocked readers are admitted together
+              (readers_admitted) and next writer waits until they have entered and left.
+            - Neither side starves: reader waits for at most one writer, writer waits for at
+              most one batch of readers.
+
+    - Timeouts: acquire_* returns False on timeout (like Lock.acquire), *_locked() raise
+      TimeoutError. A writer that gives up un-counts itself and wakes readers blocked on it.
+"""
+import threading
+import time
+import random
+from contextlib import contextmanager
+from enum import Enum
+
+from .lock_profiler import new_condition, new_lock
+
+
+class RWLockPolicy(Enum):
+    READER_PREFERRING = 1
+    WRITER_PREFERRING = 2
+    PHASE_FAIR = 3
+
+
+class RWLock:
+    def __init__(self, policy=RWLockPolicy.PHASE_FAIR, profiler=None):
+        # profiler: optional LockProfiler (lock_profiler.py) to record contention.
+        self.policy = policy
+        self.lock = new_lock("RWLock.lock", profiler)
+        self.state_changed = new_condition(self.lock, "RWLock.state_changed", profiler)
+
+        self.active_readers = 0
+        self.writer_active = False
+        self.writer_owner = None
+        self.waiting_writers = 0
+
+        # Phase fair bookkeeping.
+        self.blocked_readers = 0
+        self.readers_admitted = 0
+        self.write_releases = 0
+
+    def acquire_read(self, timeout=None):
+        with self.state_changed:
+            if self.policy == RWLockPolicy.READER_PREFERRING:
+                if not self.state_changed.wait_for(lambda: not self.writer_active, timeout):
+                    return False
+
+            elif self.policy == RWLockPolicy.WRITER_PREFERRING:
+                if not self.state_changed.wait_for(
+                    lambda: not self.writer_active and self.waiting_writers == 0, timeout
+                ):
+                    return False
+
+            elif self.writer_active or self.waiting_writers:
+                # Phase fair: wait for current/next write phase to finish.
+                phase = self.write_releases
+                self.blocked_readers += 1
+                admitted = self.state_changed.wait_for(lambda: self.write_releases != phase, timeout)
+                self.blocked_readers -= 1
+                if not admitted:
+                    return False
+                self.readers_admitted -= 1
+
+            self.active_readers += 1
+            return True
+
+    def release_read(self):
+        with self.state_changed:
+            if self.active_readers == 0:
+                raise RuntimeError("release_read() called without a matching acquire_read()")
+            self.active_readers -= 1
+            if self.active_readers == 0:
+                self.state_changed.notify_all()
+
+    def _can_write(self):
+        return not self.writer_active and self.active_readers == 0 and self.readers_admitted == 0
+
+    def _end_write_phase(self):
+        self.write_releases += 1
+        self.readers_admitted = self.blocked_readers
+
+    def acquire_write(self, timeout=None):
+        with self.state_changed:
+            self.waiting_writers += 1
+            acquired = self.state_changed.wait_for(self._can_write, timeout)
+            self.waiting_writers -= 1
+
+            if not acquired:
+                if self.policy == RWLockPolicy.PHASE_FAIR and not self.writer_active and not self.waiting_writers:
+                    # Readers were blocked behind this writer, let them in.
+                    self._end_write_phase()
+                self.state_changed.notify_all()
+                return False
+
+            self.writer_active = True
+            self.writer_owner = threading.get_ident()
+            return True
+
+    def release_write(self):
+        with self.state_changed:
+            if not self.writer_active or self.writer_owner != threading.get_ident():
+                raise RuntimeError("release_write() called by a thread not holding the write lock")
+            self.writer_active = False
+            self.writer_owner = None
+            if self.policy == RWLockPolicy.PHASE_FAIR:
+                self._end_write_phase()
+            self.state_changed.notify_all()
+
+    @contextmanager
+    def read_locked(self, timeout=None):
+        if not self.acquire_read(timeout):
+            raise TimeoutError(f"Unable to acquire read lock within {timeout} seconds")
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self, timeout=None):
+        if not self.acquire_write(timeout):
+            raise TimeoutError(f"Unable to acquire write lock within {timeout} seconds")
+        try:
+            yield self
+        finally:
+            self.release_write()
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    # Read mostly routing table, 8 readers and 2 writers for 1 second per policy.
+    for policy in RWLockPolicy:
+        rw_lock = RWLock(policy)
+        routes = {"service": "10.0.0.1"}
+        read_counts, write_counts = [], []
+        max_write_wait = [0.0]
+        stop = threading.Event()
+
+        def reader():
+            reads = 0
+            while not stop.is_set():
+                with rw_lock.read_locked():
+                    _ = routes["service"]
+                    time.sleep(0.001)
+                reads += 1
+            read_counts.append(reads)
+
+        def writer():
+            writes = 0
+            while not stop.is_set():
+                start = time.monotonic()
+                with rw_lock.write_locked():
+                    max_write_wait[0] = max(max_write_wait[0], time.monotonic() - start)
+                    routes["service"] = f"10.0.0.{random.randint(1, 254)}"
+                writes += 1
+                time.sleep(0.01)
+            write_counts.append(writes)
+
+        threads = [threading.Thread(target=reader) for _ in range(8)] + [threading.Thread(target=writer) for _ in range(2)]
+        for t in threads:
+            t.start()
+        time.sleep(1)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        print(f"{policy.name}: reads={sum(read_counts)}, writes={sum(write_counts)}, "
+              f"max writer wait={max_write_wait[0] * 1000:.1f}ms")
+
+    # Reader times out while write lock is held.
+    rw_lock = RWLock()
+    rw_lock.acquire_write()
+    try:
+        with rw_lock.read_locked(timeout=0.1):
+            pass
+    except TimeoutError as e:
+        print(f"Timed out as expected: {e}")
+    rw_lock.release_write()
@@ -0,0 +1,185 @@
+"""
+Problem Statement:
+    - No way to compare ReaderWriterLock (reader_writer_problem.py) against
+      WritePriorityReaderWriterLock (reader_writer_v2.py), or the newer RWLock / BigReaderLock,
+      quantitatively.
+    - Benchmark sweeping:
+        - read:write ratio (100:0 ... 50:50)
+        - thread count
+        - critical section length
+    - Report ops/sec, read p99, write p99 and worst writer wait (starvation), export JSON/CSV.
+
+Approach:
+    - Every lock exposes acquire_read/release_read/acquire_write/release_write and is used
+      directly:
+        - ReaderWriterLock / WritePriorityReaderWriterLock: read()/write() are built on those
+          methods, so the benchmark runs their real protocol without the print + sleep and
+          controls the critical section itself.
+        - RWLock (every policy) and BigReaderLock.
+    - run_case(lock, read_pct, threads, cs_us, duration):
+        - Every thread picks read/write with its own seeded random, so a case is repeatable.
+        - Latency = acquire + critical section + release. Writer wait = acquire only.
+        - Critical section: time.sleep (releases the GIL, like io) or spin (holds the GIL,
+          like cpu work), --cs-kind.
+    - Sweep every combination, print a table and optionally write --json / --csv.
+    - Stall detection: worker threads are daemons joined with a timeout. A case whose threads
+      don't stop within stall_timeout after the run is reported with deadlocked=True (the
+      threads are abandoned) and the sweep goes on.
+
+Findings:
+    - WritePriorityReaderWriterLock deadlocks with readers and writers mixed: a reader waits
+      for the writer flag while holding read_lock, the writer waits for resource_lock held by
+      active readers, and those readers need read_lock to release it. RWLock's
+      WRITER_PREFERRING policy has the same preference without this deadlock.
+
+Usage:
+    python -m concurrency_patterns.rw_lock_benchmark --ratios 100 90 50 --threads 2 8 --cs-us 0 100 --json out.json
+"""
+import argparse
+import csv
+import json
+import random
+import threading
+import time
+
+from .big_reader_lock import BigReaderLock
+from .reader_writer_problem import ReaderWriterLock
+from .reader_writer_v2 import WritePriorityReaderWriterLock
+from .rw_lock import RWLock, RWLockPolicy
+
+
+LOCKS = {
+    "ReaderWriterLock": ReaderWriterLock,
+    "WritePriorityReaderWriterLock": WritePriorityReaderWriterLock,
+    "RWLock[reader]": lambda: RWLock(RWLockPolicy.READER_PREFERRING),
+    "RWLock[writer]": lambda: RWLock(RWLockPolicy.WRITER_PREFERRING),
+    "RWLock[phase_fair]": lambda: RWLock(RWLockPolicy.PHASE_FAIR),
+    "BigReaderLock": BigReaderLock,
+}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def critical_section(cs_us, cs_kind):
+    if cs_us <= 0:
+        return
+    if cs_kind == "sleep":
+        time.sleep(cs_us / 1e6)
+    else:
+        end = time.perf_counter() + cs_us / 1e6
+        while time.perf_counter() < end:
+            pass
+
+
+def run_case(lock_name, read_pct, num_threads, cs_us, duration=0.5, cs_kind="sleep", seed=0, stall_timeout=2.0):
+    lock = LOCKS[lock_name]()
+    go = threading.Event()
+    stop = threading.Event()
+    read_latencies, write_latencies, write_waits = [], [], []
+    ops = []
+
+    def worker(worker_id):
+        rng = random.Random(seed * 1000 + worker_id)
+        reads, writes, waits = [], [], []
+        count = 0
+        go.wait()
+        while not stop.is_set():
+            start = time.perf_counter()
+            if rng.random() * 100 < read_pct:
+                lock.acquire_read()
+                critical_section(cs_us, cs_kind)
+                lock.release_read()
+                reads.append(time.perf_counter() - start)
+            else:
+                lock.acquire_write()
+                waits.append(time.perf_counter() - start)
+                critical_section(cs_us, cs_kind)
+                lock.release_write()
+                writes.append(time.perf_counter() - start)
+            count += 1
+
+        read_latencies.extend(reads)
+        write_latencies.extend(writes)
+        write_waits.extend(waits)
+        ops.append(count)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(num_threads)]
+    for t in threads:
+        t.start()
+    start = time.perf_counter()
+    go.set()
+    time.sleep(duration)
+    stop.set()
+    elapsed = time.perf_counter() - start
+    deadline = time.monotonic() + stall_timeout
+    for t in threads:
+        t.join(max(0, deadline - time.monotonic()))
+    deadlocked = any(t.is_alive() for t in threads)
+
+    return {
+        "lock": lock_name,
+        "read_pct": read_pct,
+        "threads": num_threads,
+        "cs_us": cs_us,
+        "cs_kind": cs_kind,
+        "ops_per_sec": round(sum(ops) / elapsed, 1),
+        "read_p99_us": round(percentile(read_latencies, 99) * 1e6, 1),
+        "write_p99_us": round(percentile(write_latencies, 99) * 1e6, 1),
+        "max_writer_wait_ms": round(max(write_waits, default=0.0) * 1e3, 2),
+        "deadlocked": deadlocked,
+    }
+
+
+def run_sweep(locks, ratios, thread_counts, cs_lengths, duration, cs_kind, seed=0):
+    results = []
+    for read_pct in ratios:
+        for num_threads in thread_counts:
+            for cs_us in cs_lengths:
+                for lock_name in locks:
+                    result = run_case(lock_name, read_pct, num_threads, cs_us, duration, cs_kind, seed)
+                    results.append(result)
+                    print(f"{lock_name:<30} {read_pct:>3}:{100 - read_pct:<3} threads={num_threads:<3} "
+                          f"cs={cs_us:>4}us  ops/s={result['ops_per_sec']:>10}  "
+                          f"read_p99={result['read_p99_us']:>9}us  write_p99={result['write_p99_us']:>9}us  "
+                          f"max_writer_wait={result['max_writer_wait_ms']:>8}ms"
+                          f"{'  DEADLOCKED' if result['deadlocked'] else ''}")
+    return results
+
+
+def export(results, json_path=None, csv_path=None):
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(results, f, indent=2)
+    if csv_path and results:
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reader-writer lock contention benchmark")
+    parser.add_argument("--locks", nargs="+", default=list(LOCKS), choices=list(LOCKS))
+    parser.add_argument("--ratios", nargs="+", type=int, default=[100, 95, 90, 75, 50],
+                        help="read percentage, rest are writes")
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, 4, 16])
+    parser.add_argument("--cs-us", nargs="+", type=int, default=[0, 100], help="critical section length (us)")
+    parser.add_argument("--cs-kind", choices=["sleep", "spin"], default="sleep")
+    parser.add_argument("--duration", type=float, default=0.3, help="seconds per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json")
+    parser.add_argument("--csv")
+    args = parser.parse_args(argv)
+
+    results = run_sweep(args.locks, args.ratios, args.threads, args.cs_us, args.duration, args.cs_kind, args.seed)
+    export(results, args.json, args.csv)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Problem Statement:
+    - One WebCrawler process is limited by the GIL while parsing pages, and all of its state
+      (urls_to_visit, visited_urls) lives in that one process.
+    - Shard the crawl across N worker processes by hash of the host:
+        - Each shard owns its own frontier and visited set.
+        - Discovered links are forwarded to their owning shard in batches.
+        - Results of all shards are merged at the end.
+
+Approach:
+    - shard_of(url) = blake2b(host) % N. (Built-in hash() of str is randomized per process,
+      so it can't be used for routing between processes.)
+    - One inbox (multiprocessing.Queue) per shard, messages are lists of urls (batches) or
+      None (stop).
+    - Shard loop:
+        - Local frontier empty --> flush outgoing batches, block on inbox.
+        - Incoming url --> dedup with local visited set (only the owner ever sees a url, so no
+          cross process visited set is needed).
+        - Links owned by same shard go directly to local frontier, others are buffered per
+          destination shard and sent once batch_size is reached (or when shard goes idle).
+
+    - Termination (work counting, same idea as WebCrawler v2 but across processes):
+        - pending: shared multiprocessing.Value = urls sent/buffered but not yet processed.
+        - Each shard keeps a local delta (urls buffered/queued locally - urls finished) and
+          applies it to pending before sending any batch. Children are counted before their
+          parent is discounted, so pending hits 0 only when nothing is queued, buffered or in
+          flight anywhere.
+        - Shard which brings pending to 0 puts None in every inbox, all shards exit and send
+          their crawled urls to result queue.
+    - Dead shard: main process polls result queue with a timeout and checks every shard that
+      hasn't reported yet. One that exited without sending results (crashed, killed) can never
+      bring pending to 0, so the other shards are terminated and RuntimeError is raised
+      instead of waiting forever.
+"""
+import hashlib
+import multiprocessing
+import queue
+import time
+from collections import defaultdict
+
+from .multithreaded_webcrawler_v2 import HtmlParser, UrlSet, get_hostname, normalize_url
+
+
+def shard_of(url, num_shards):
+    digest = hashlib.blake2b(get_hostname(url).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % num_shards
+
+
+class CrawlShard:
+    def __init__(self, shard_id, inboxes, pending, result_queue, htmlParser, allowed_hosts, batch_size, visited_factory):
+        self.shard_id = shard_id
+        self.num_shards = len(inboxes)
+        self.inboxes = inboxes
+        self.pending = pending
+        self.result_queue = result_queue
+        self.htmlParser = htmlParser
+        self.allowed_hosts = allowed_hosts
+        self.batch_size = batch_size
+
+        self.urls_to_visit = []
+        self.visited_urls = visited_factory()
+        self.crawled_urls = []
+        self.out_batches = defaultdict(list)
+        self.pending_delta = 0
+
+    def should_crawl(self, url):
+        return self.allowed_hosts is None or get_hostname(url) in self.allowed_hosts
+
+    def receive(self, urls):
+        for url in urls:
+            if self.visited_urls.add(url):
+                self.urls_to_visit.append(url)
+            else:
+                # Duplicate, finished without any work.
+                self.pending_delta -= 1
+
+    def forward(self, links, base):
+        for url in links:
+            try:
+                url = normalize_url(url, base)
+            except ValueError:
+                continue
+            if not self.should_crawl(url):
+                continue
+
+            owner = shard_of(url, self.num_shards)
+            if owner == self.shard_id:
+                if self.visited_urls.add(url):
+                    self.urls_to_visit.append(url)
+                    self.pending_delta += 1
+            else:
+                self.out_batches[owner].append(url)
+                self.pending_delta += 1
+                if len(self.out_batches[owner]) >= self.batch_size:
+                    self.flush()
+
+    def flush(self):
+        """
+        Publish local delta to pending first, then send batches. Receivers can only
+        discount urls that were already counted.
+        """
+        with self.pending.get_lock():
+            self.pending.value += self.pending_delta
+            finished = self.pending.value == 0
+        self.pending_delta = 0
+
+        for owner, urls in self.out_batches.items():
+            if urls:
+                self.inboxes[owner].put(urls)
+        self.out_batches.clear()
+
+        if finished:
+            for inbox in self.inboxes:
+                inbox.put(None)
+
+    def run(self):
+        while True:
+            if not self.urls_to_visit:
+                self.flush()
+                batch = self.inboxes[self.shard_id].get()
+                if batch is None:
+                    break
+                self.receive(batch)
+                continue
+
+            url_to_traverse = self.urls_to_visit.pop()
+            self.crawled_urls.append(url_to_traverse)
+            try:
+                self.forward(self.htmlParser.getUrls(url_to_traverse), url_to_traverse)
+            except Exception as e:
+                print(f"[Shard-{self.shard_id}] Unable to process url: {url_to_traverse}, error: {e}")
+            self.pending_delta -= 1
+
+        self.result_queue.put((self.shard_id, self.crawled_urls))
+
+
+def run_shard(*args):
+    CrawlShard(*args).run()
+
+
+def collect_results(shards, result_queue, poll_interval):
+    results = {}
+    while len(results) < len(shards):
+        try:
+            shard_id, urls = result_queue.get(timeout=poll_interval)
+            results[shard_id] = urls
+            continue
+        except queue.Empty:
+            pass
+
+        for shard_id, shard in enumerate(shards):
+            if shard_id in results or shard.exitcode is None:
+                continue
+            # Exited, but its results may still be in the pipe: drain once more before failing.
+            try:
+                while True:
+                    reported_id, urls = result_queue.get(timeout=poll_interval)
+                    results[reported_id] = urls
+            except queue.Empty:
+                pass
+            if shard_id not in results:
+                for other in shards:
+                    if other.exitcode is None:
+                        other.terminate()
+                raise RuntimeError(f"Shard-{shard_id} exited with code {shard.exitcode} before finishing the crawl")
+    return results
+
+
+def sharded_crawl(startUrl, htmlParser, num_shards=None, allowed_hosts=None, batch_size=64, visited_factory=UrlSet,
+                  poll_interval=0.5):
+    """
+    Crawl from startUrl with num_shards processes (default: cpu count). htmlParser must be
+    picklable. allowed_hosts=None follows links to any host. Raises RuntimeError if a shard
+    process dies (checked every poll_interval seconds).
+    """
+    num_shards = num_shards or multiprocessing.cpu_count()
+    inboxes = [multiprocessing.Queue() for _ in range(num_shards)]
+    pending = multiprocessing.Value("q", 0)
+    result_queue = multiprocessing.Queue()
+
+    start_url = normalize_url(startUrl)
+    pending.value = 1
+    inboxes[shard_of(start_url, num_shards)].put([start_url])
+
+    shards = [
+        multiprocessing.Process(
+            target=run_shard,
+            args=(shard_id, inboxes, pending, result_queue, htmlParser, allowed_hosts, batch_size, visited_factory),
+        )
+        for shard_id in range(num_shards)
+    ]
+    for shard in shards:
+        shard.start()
+
+    # Drain results before join, a process can't exit while its queue has unflushed data.
+    results = collect_results(shards, result_queue, poll_interval)
+    for shard in shards:
+        shard.join()
+
+    return [url for shard_id in range(num_shards) for url in results[shard_id]]
+
+
+class CpuBoundHtmlParser(HtmlParser):
+    """
+    Fake parser that burns CPU (holding the GIL) instead of sleeping, like real html parsing.
+    """
+    def __init__(self, graph, work=5_000):
+        super().__init__(graph)
+        self.work = work
+
+    def getUrls(self, url: str) -> list[str]:
+        digest = url.encode()
+        for _ in range(self.work):
+            digest = hashlib.md5(digest).digest()
+        return super().getUrls(url)
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    hosts = [f"host{h}.com" for h in range(16)]
+    graph = {}
+    for h, host in enumerate(hosts):
+        for i in range(50):
+            graph[f"http://{host}/{i}"] = [f"http://{host}/{i+1}", f"http://{hosts[(h+1) % len(hosts)]}/{i}"]
+    parser = CpuBoundHtmlParser(graph)
+
+    for num_shards in [1, 2, 4]:
+        start = time.monotonic()
+        urls = sharded_crawl("http://host0.com/0", parser, num_shards=num_shards)
+        print(f"{num_shards} shard(s): crawled {len(urls)} urls ({len(set(urls))} unique) "
+              f"in {time.monotonic() - start:.2f}s")
@@ -0,0 +1,151 @@
+"""
+Problem Statement:
+    - WebCrawler.urls_to_visit is an in-memory list with no size limit. On wide sites it grows
+      to tens of millions of urls and crawler runs out of memory.
+    - Keep a bounded hot window in memory, spill the overflow to sequential segment files on
+      local disk and read segments back in order with read-ahead. Memory use should stay flat
+      however big the frontier gets.
+
+Approach:
+    - Frontier is FIFO and made of 3 parts, in order:
+        [head (in memory)] --> [segment files on disk] --> [tail buffer (in memory)]
+        - append: goes to head while nothing is spilled and head has space, else to tail.
+          When tail reaches segment_size it becomes the last segment and is handed to the io
+          thread to be written as one sequential file (one url per line).
+        - pop: from head. When head is empty it is refilled with the next segment, or with
+          the tail if no segments are left.
+    - All disk io runs on one background io thread (single worker, so a segment is always
+      written before it is read back):
+        - Writes never block append, which runs under crawler's unvisited_lock.
+        - Read-ahead: as soon as a segment is loaded into head, next segment is read, so pop
+          only waits for disk if a whole segment is consumed faster than one file read.
+    - Memory is bounded by ~3 * segment_size urls (head + prefetched segment + tail), plus
+      segments still queued for writing if disk is slower than the crawl.
+    - Same interface as the list used by WebCrawler (append/extend/pop/len), and like the
+      list it is guarded by crawler's unvisited_lock.
+    - Owns a thread and a temp directory: use as context manager (or call close()).
+
+Note:
+    - Frontier memory is flat, but the rest of the crawl still grows with number of urls:
+        - visited set: use ScalableBloomFilter from multithreaded_webcrawler_v2.py.
+        - results: WebCrawler keeps every crawled url in crawled_urls unless on_crawled is
+          given, e.g. to stream them to a file.
+"""
+import os
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .multithreaded_webcrawler_v2 import HtmlParser, ScalableBloomFilter, WebCrawler
+
+
+class SpillingFrontier:
+    def __init__(self, segment_size=100_000, spill_dir=None):
+        self.segment_size = segment_size
+        self.owns_dir = spill_dir is None
+        self.spill_dir = spill_dir or tempfile.mkdtemp(prefix="frontier-")
+        self.head = deque()
+        self.tail = []
+        self.segments = deque()
+        self.next_segment_id = 0
+        self.size = 0
+        self.spilled_segments = 0
+        self.io_executor = ThreadPoolExecutor(max_workers=1)
+        self.prefetch = None
+
+    @staticmethod
+    def _write_file(path, urls):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(urls))
+
+    def _write_segment(self):
+        path = os.path.join(self.spill_dir, f"segment-{self.next_segment_id:08d}.txt")
+        self.next_segment_id += 1
+        self.io_executor.submit(self._write_file, path, self.tail)
+        self.segments.append(path)
+        self.spilled_segments += 1
+        self.tail = []
+        if self.prefetch is None:
+            self._start_prefetch()
+
+    @staticmethod
+    def _read_segment(path):
+        with open(path, encoding="utf-8") as f:
+            urls = f.read().split("\n")
+        os.remove(path)
+        return urls
+
+    def _start_prefetch(self):
+        if self.segments:
+            self.prefetch = self.io_executor.submit(self._read_segment, self.segments.popleft())
+
+    def _refill_head(self):
+        if self.prefetch is not None:
+            self.head.extend(self.prefetch.result())
+            self.prefetch = None
+            self._start_prefetch()
+        else:
+            self.head.extend(self.tail)
+            self.tail = []
+
+    def append(self, url):
+        self.size += 1
+        if self.prefetch is None and not self.tail and len(self.head) < self.segment_size:
+            self.head.append(url)
+            return
+
+        self.tail.append(url)
+        if len(self.tail) >= self.segment_size:
+            self._write_segment()
+
+    def extend(self, urls):
+        for url in urls:
+            self.append(url)
+
+    def pop(self):
+        if self.size == 0:
+            raise IndexError("pop from empty frontier")
+        if not self.head:
+            self._refill_head()
+        self.size -= 1
+        return self.head.popleft()
+
+    def __len__(self):
+        return self.size
+
+    def close(self):
+        self.io_executor.shutdown(wait=True, cancel_futures=True)
+        if self.owns_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    # Wide site: every page links to 50 new pages, ~20k pages in total.
+    pages = 20_000
+    graph = {f"http://wide.com/{i}": [f"http://wide.com/{j}" for j in range(i * 50 + 1, min(i * 50 + 51, pages))]
+             for i in range(pages)}
+
+    crawled_count = [0]
+
+    def count_crawled(url):
+        crawled_count[0] += 1
+
+    with SpillingFrontier(segment_size=500) as frontier:
+        wc = WebCrawler(HtmlParser(graph), visited_urls=ScalableBloomFilter(initial_capacity=1000),
+                        urls_to_visit=frontier, on_crawled=count_crawled)
+        wc.set_start_url("http://wide.com/0")
+
+        start = time.monotonic()
+        wc.crawl()
+        # A few urls less than pages are expected, bloom filter false positives are skipped.
+        print(f"Crawled {crawled_count[0]} urls in {time.monotonic() - start:.2f}s, "
+              f"spilled {frontier.spilled_segments} segments of {frontier.segment_size} urls")
@@ -0,0 +1,323 @@
+"""
+Problem Statement:
+    - JobScheduler, WebCrawler and the simulations each start their own threads, and every
+      thread takes work from one shared, locked container. With recursive work (a crawled page
+      adds links, a finished job enables its dependents) every new task goes through that one
+      container.
+    - General executor instead:
+        - Local deque per worker. A worker pushes and pops its own tasks at one end; an idle
+          worker steals from the other end of another worker's deque.
+        - Fan out: a task can submit subtasks, and can wait for them without blocking its
+          worker.
+        - submit / map / Future API of concurrent.futures, benchmark against
+          ThreadPoolExecutor.
+
+Approach:
+    - WorkStealingExecutor is a concurrent.futures.Executor: submit() returns a
+      concurrent.futures.Future, map() / shutdown() / with-block come from Executor, so it
+      can replace ThreadPoolExecutor as is.
+    - Every worker owns a deque:
+        - submit() from inside a task (fan out): append on the right of the worker's own
+          deque, no lock.
+        - Owner pops from the right (LIFO): newest subtask first, its data is still hot and
+          the deque stays short.
+        - Thief pops from the left (FIFO): oldest task, in a recursive split usually the
+          biggest remaining piece, so steals are rare. Victims are scanned from a random
+          worker, so thieves spread out.
+        - CPython deque append / pop / popleft are atomic, so owner and thieves need no lock
+          around the deque: both ends may race for the last item, one of them gets
+          IndexError.
+    - submit() from outside the pool: appendleft on the next worker's deque (round robin),
+      under the executor lock (also rejects submit after shutdown). The owner still pops its
+      own subtasks first and runs external tasks in FIFO order.
+    - Sleeping: a worker which found nothing in its own deque and nothing to steal takes the
+      lock, increments sleepers and scans all deques again before waiting on
+      work_available. submit() pushes first and then notifies only if sleepers > 0, so the
+      common fan out path takes no lock, and no wakeup is lost (either the scan sees the
+      task, or the submitter sees the sleeper).
+    - gather(futures): results in order. Called from a task, the worker keeps running its own
+      / stolen tasks until the futures are done instead of blocking, so recursive fork-join
+      can't deadlock the pool (ThreadPoolExecutor deadlocks once every worker waits on a
+      queued subtask).
+    - wait_all(): blocks until every submitted task, subtasks included, finished (crawl / DAG
+      expansion don't know their task count up front).
+        - Per worker submitted / completed counters, written by the owner thread only, plus
+          external submits under the lock.
+        - Quiescent when completed == submitted, completed read first: a task only submits
+          while running, so counts that match in this order can't miss a subtask.
+        - Checked when a worker goes to sleep, which is when the last task finished.
+    - shutdown(wait, cancel_futures): no new external tasks, workers drain every deque
+      (tasks still running may fan out more), then exit.
+
+Note:
+    - With the GIL, pure Python tasks don't run in parallel; the gain is less scheduling
+      overhead and contention per task. Tasks that release the GIL (io, numpy) also run
+      in parallel.
+    - gather() runs other tasks on the waiting task's stack, very deep recursion can hit the
+      recursion limit.
+"""
+import itertools
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+
+from .lock_profiler import new_condition, new_lock
+
+
+class Worker:
+    def __init__(self, index, seed=None):
+        self.index = index
+        self.tasks = deque()  # (future, fn, args, kwargs)
+        self.rng = random.Random(None if seed is None else seed + index)
+        self.thread = None
+        # Written by this worker's thread only.
+        self.submitted = 0
+        self.completed = 0
+        self.stolen = 0
+        self.failed_steals = 0
+        self.sleeps = 0
+
+
+class WorkStealingExecutor(Executor):
+    def __init__(self, num_workers=None, thread_name_prefix="WorkStealingExecutor", seed=None, profiler=None):
+        num_workers = num_workers or min(32, (os.cpu_count() or 1) + 4)
+        # profiler: optional LockProfiler (lock_profiler.py) to record contention.
+        self.lock = new_lock("WorkStealingExecutor.lock", profiler)
+        self.work_available = new_condition(self.lock, "WorkStealingExecutor.work_available", profiler)
+        self.quiescent = new_condition(self.lock, "WorkStealingExecutor.quiescent", profiler)
+        self.sleepers = 0
+        self.is_shutdown = False
+        self.external_submitted = 0
+        self.cancelled = 0
+        self.next_worker = 0
+        self.local = threading.local()
+
+        self.workers = [Worker(i, seed) for i in range(num_workers)]
+        for worker in self.workers:
+            worker.thread = threading.Thread(target=self._run, args=(worker,),
+                                             name=f"{thread_name_prefix}-{worker.index}", daemon=True)
+            worker.thread.start()
+
+    def _current_worker(self):
+        return getattr(self.local, "worker", None)
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        item = (future, fn, args, kwargs)
+        worker = self._current_worker()
+        if worker is None:
+            with self.lock:
+                if self.is_shutdown:
+                    raise RuntimeError("cannot schedule new futures after shutdown")
+                self.external_submitted += 1
+                self.workers[self.next_worker].tasks.appendleft(item)
+                self.next_worker = (self.next_worker + 1) % len(self.workers)
+                if self.sleepers:
+                    self.work_available.notify()
+            return future
+
+        worker.submitted += 1
+        worker.tasks.append(item)
+        if self.sleepers:
+            with self.lock:
+                self.work_available.notify()
+        return future
+
+    def _find_task(self, worker):
+        try:
+            return worker.tasks.pop()
+        except IndexError:
+            pass
+        start = worker.rng.randrange(len(self.workers))
+        for i in range(len(self.workers)):
+            victim = self.workers[(start + i) % len(self.workers)]
+            if victim is worker:
+                continue
+            try:
+                item = victim.tasks.popleft()
+            except IndexError:
+                continue
+            worker.stolen += 1
+            return item
+        worker.failed_steals += 1
+        return None
+
+    @staticmethod
+    def _run_task(worker, item):
+        future, fn, args, kwargs = item
+        if future.set_running_or_notify_cancel():
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+        worker.completed += 1
+
+    def _has_work(self):
+        return any(worker.tasks for worker in self.workers)
+
+    def _is_quiescent(self):
+        completed = sum(worker.completed for worker in self.workers) + self.cancelled
+        submitted = sum(worker.submitted for worker in self.workers) + self.external_submitted
+        return completed == submitted
+
+    def _run(self, worker):
+        self.local.worker = worker
+        while True:
+            item = self._find_task(worker)
+            if item is not None:
+                self._run_task(worker, item)
+                continue
+
+            with self.lock:
+                # Count as sleeper before the rescan: a subtask pushed after the scan sees
+                # sleepers > 0 and notifies (submit pushes first, then reads sleepers).
+                self.sleepers += 1
+                if self._has_work():
+                    self.sleepers -= 1
+                    continue
+                if self._is_quiescent():
+                    self.quiescent.notify_all()
+                if self.is_shutdown:
+                    self.sleepers -= 1
+                    return
+                worker.sleeps += 1
+                self.work_available.wait()
+                self.sleepers -= 1
+
+    def gather(self, futures):
+        """
+        Results of futures in order. From a task, runs queued tasks while waiting.
+        """
+        futures = list(futures)
+        worker = self._current_worker()
+        if worker is not None:
+            for future in futures:
+                while not future.done():
+                    item = self._find_task(worker)
+                    if item is not None:
+                        self._run_task(worker, item)
+                    else:
+                        # Being run by another worker, check for new work every millisecond.
+                        wait_futures([future], timeout=0.001)
+        return [future.result() for future in futures]
+
+    def wait_all(self, timeout=None):
+        """
+        Blocks until every submitted task, including subtasks, finished. False on timeout.
+        """
+        if self._current_worker() is not None:
+            raise RuntimeError("wait_all() called from a task would wait for itself, use gather()")
+        with self.lock:
+            return self.quiescent.wait_for(self._is_quiescent, timeout)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self.lock:
+            self.is_shutdown = True
+            if cancel_futures:
+                for worker in self.workers:
+                    while True:
+                        try:
+                            future = worker.tasks.popleft()[0]
+                        except IndexError:
+                            break
+                        future.cancel()
+                        self.cancelled += 1
+            self.work_available.notify_all()
+        if wait and self._current_worker() is None:
+            for worker in self.workers:
+                worker.thread.join()
+
+    def stats(self):
+        return {
+            "workers": len(self.workers),
+            "completed": sum(worker.completed for worker in self.workers),
+            "stolen": sum(worker.stolen for worker in self.workers),
+            "failed_steals": sum(worker.failed_steals for worker in self.workers),
+            "sleeps": sum(worker.sleeps for worker in self.workers),
+            "completed_per_worker": [worker.completed for worker in self.workers],
+        }
+
+
+def fan_out(executor, depth, branching, work=0):
+    """
+    Tree of tasks, every task does `work` iterations of busy work and submits `branching`
+    children until depth. Blocks until all sum(branching ** d) tasks ran, returns the
+    submit -> start delay of every task (seconds).
+    Works with any Executor whose tasks may submit (WorkStealingExecutor, ThreadPoolExecutor).
+    """
+    total = sum(branching ** level for level in range(depth + 1))
+    finished = itertools.count(1)  # next() is atomic, no lock shared by all tasks
+    done = threading.Event()
+    delays = []
+
+    def task(level, submitted_at):
+        delays.append(time.perf_counter() - submitted_at)
+        for _ in range(work):
+            pass
+        if level < depth:
+            for _ in range(branching):
+                executor.submit(task, level + 1, time.perf_counter())
+        if next(finished) == total:
+            done.set()
+
+    executor.submit(task, 0, time.perf_counter())
+    done.wait()
+    return delays
+
+
+if __name__ == "__main__":
+    ###### TESTING #########
+    from .rw_lock_benchmark import percentile
+
+    workers = 4
+    print(f"{workers} workers, tree fan out depth 6 x branching 6 (55987 tasks), 200 iterations each:")
+    for name, executor_cls in (("WorkStealingExecutor", WorkStealingExecutor), ("ThreadPoolExecutor", ThreadPoolExecutor)):
+        with executor_cls(workers) as executor:
+            start = time.perf_counter()
+            delays = fan_out(executor, depth=6, branching=6, work=200)
+            elapsed = time.perf_counter() - start
+        print(f"  {name:<22} {len(delays) / elapsed:>9.0f} tasks/s, submit->start p50/p99 "
+              f"{percentile(delays, 50) * 1e3:.2f}/{percentile(delays, 99) * 1e3:.2f}ms")
+
+    print("map over 50000 items:")
+    for name, executor_cls in (("WorkStealingExecutor", WorkStealingExecutor), ("ThreadPoolExecutor", ThreadPoolExecutor)):
+        with executor_cls(workers) as executor:
+            start = time.perf_counter()
+            total = sum(executor.map(abs, range(-25000, 25000)))
+            elapsed = time.perf_counter() - start
+        print(f"  {name:<22} {50000 / elapsed:>9.0f} tasks/s (sum {total})")
+
+    # Recursive fork-join: every task waits for its two halves. ThreadPoolExecutor deadlocks
+    # here once all its workers wait on queued subtasks; gather() keeps the workers busy.
+    executor = WorkStealingExecutor(workers, seed=1)
+
+    def parallel_sum(lo, hi):
+        if hi - lo <= 1000:
+            return sum(range(lo, hi))
+        mid = (lo + hi) // 2
+        return sum(executor.gather([executor.submit(parallel_sum, lo, mid), executor.submit(parallel_sum, mid, hi)]))
+
+    result = executor.submit(parallel_sum, 0, 1_000_000).result()
+    print(f"fork-join sum(range(1e6)) = {result} (expected {sum(range(1_000_000))}), stats {executor.stats()}")
+
+    # Crawl like fan out: unknown number of tasks, wait_all() for the whole tree.
+    visited, visited_lock = set(), threading.Lock()
+    links = {page: [(page * 7 + k) % 5000 for k in range(1, 6)] for page in range(5000)}
+
+    def visit(page):
+        with visited_lock:
+            if page in visited:
+                return
+            visited.add(page)
+        for link in links[page]:
+            executor.submit(visit, link)
+
+    executor.submit(visit, 0)
+    print(f"crawl: wait_all() -> {executor.wait_all(timeout=30)}, visited {len(visited)} pages")
+    executor.shutdown()
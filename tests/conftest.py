@@ -0,0 +1,34 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def run_bounded():
+    """
+    run_bounded(fn, *args, timeout=10) runs fn in a daemon thread and fails the test if it
+    hasn't returned within timeout (a hang would otherwise block the whole test session).
+    """
+    def run(fn, *args, timeout=10):
+        outcome = {}
+
+        def target():
+            try:
+                outcome["result"] = fn(*args)
+            except BaseException as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            pytest.fail(f"{getattr(fn, '__name__', fn)} did not return within {timeout}s")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome.get("result")
+
+    return run
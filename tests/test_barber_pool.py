@@ -0,0 +1,65 @@
+import time
+from collections import deque
+
+import pytest
+
+from concurrency_patterns.barber_pool import BarberPool, Customer, ShedPolicy, admit
+
+
+def test_serve_raising_fails_customer_and_keeps_barbers_alive():
+    def serve(customer):
+        if customer.service_time < 0:
+            raise ValueError("bad customer")
+
+    pool = BarberPool(num_barbers=2, waiting_chairs=10, serve=serve)
+    bad = [Customer(service_time=-1) for _ in range(4)]  # more failures than barbers
+    for customer in bad:
+        assert pool.submit(customer)
+    for customer in bad:
+        assert customer.done.wait(5)
+        assert customer.outcome == "failed"
+        assert isinstance(customer.error, ValueError)
+
+    good = Customer(service_time=0.001)
+    assert pool.submit(good)
+    assert good.done.wait(5)
+    assert good.outcome == "served"
+    assert all(barber.is_alive() for barber in pool.barbers)
+
+    pool.shutdown()
+    stats = pool.stats()
+    assert stats["failed"] == 4 and stats["served"] == 1
+    assert stats["failure_rate"] == pytest.approx(0.8)
+    assert stats["service_time"]["count"] == 1  # failures don't skew service time
+
+
+def test_reject_new_turns_away_customer_when_room_full():
+    pool = BarberPool(num_barbers=1, waiting_chairs=1, policy=ShedPolicy.REJECT_NEW, serve=lambda c: time.sleep(0.05))
+    customers = [Customer(service_time=0) for _ in range(3)]
+    admitted = [pool.submit(customer) for customer in customers]
+    pool.shutdown()
+    assert admitted.count(False) >= 1
+    assert all(customer.done.is_set() for customer in customers)
+
+
+def test_admit_policies_on_full_room():
+    def room(now):
+        return deque([Customer(0, deadline=now - 1), Customer(0, deadline=now + 10)])
+
+    arriving = Customer(0, deadline=100.0)
+    admitted, shed = admit(room(50.0), arriving, 50.0, ShedPolicy.REJECT_NEW, 2, lambda: 0.0)
+    assert not admitted and shed == [(arriving, "rejected")]
+
+    waiting = room(50.0)
+    oldest = waiting[0]
+    admitted, shed = admit(waiting, arriving, 50.0, ShedPolicy.DROP_OLDEST, 2, lambda: 0.0)
+    assert admitted and shed == [(oldest, "dropped")] and waiting[-1] is arriving
+
+    waiting = room(50.0)
+    expired_customer = waiting[0]
+    admitted, shed = admit(waiting, arriving, 50.0, ShedPolicy.DEADLINE_AWARE, 2, lambda: 0.0)
+    assert admitted and shed == [(expired_customer, "expired")] and len(waiting) == 2
+
+    late = Customer(0, deadline=50.5)
+    admitted, shed = admit(room(50.0), late, 50.0, ShedPolicy.DEADLINE_AWARE, 5, lambda: 1.0)
+    assert not admitted and (late, "rejected") in shed
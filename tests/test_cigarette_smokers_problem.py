@@ -0,0 +1,29 @@
+import random
+import threading
+
+from concurrency_patterns.cigarette_smokers_problem import Ingredient, SmokingTable
+
+
+def test_smokers_exit_when_agent_closes_table(run_bounded):
+    table = SmokingTable()
+    smokes = {ingredient: 0 for ingredient in Ingredient}
+
+    def smoker(ingredient):
+        while table.take_ingredients(ingredient):
+            smokes[ingredient] += 1
+            table.done_smoking()
+
+    def session(rounds):
+        smokers = [threading.Thread(target=smoker, args=(ingredient,)) for ingredient in Ingredient]
+        for t in smokers:
+            t.start()
+        rng = random.Random(0)
+        for _ in range(rounds):
+            table.put_ingredients(*rng.sample(list(Ingredient), 2))
+        table.close()
+        for t in smokers:
+            t.join()
+
+    # Random pairs: smokers get uneven turns, none may wait forever for one more.
+    run_bounded(session, 50)
+    assert sum(smokes.values()) == 50
@@ -0,0 +1,52 @@
+import threading
+import time
+
+import pytest
+
+from concurrency_patterns.connection_pool import ConnectionPool, FakeBackend, FakeConnection
+
+
+def test_connections_are_reused_and_bounded():
+    backend = FakeBackend(connect_latency=0.0005, query_latency=0.0002)
+    pool = ConnectionPool(backend.connect, max_size=3, health_check=FakeConnection.ping)
+    peak = []
+
+    def worker():
+        for i in range(50):
+            with pool.connection() as connection:
+                peak.append(pool.size)
+                connection.execute(i)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    assert max(peak) <= 3 and backend.connects <= 3
+    assert pool.stats()["acquired"] == 400
+    pool.close()
+    assert backend.open_connections == 0
+
+
+def test_acquire_timeout_and_failed_health_check():
+    backend = FakeBackend(connect_latency=0.0, query_latency=0.0)
+    pool = ConnectionPool(backend.connect, max_size=1, health_check=FakeConnection.ping)
+    connection = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    backend.restart()
+    pool.release(connection)
+    stats = pool.stats()
+    assert (stats["timeouts"], stats["failed_health_checks"], stats["size"]) == (1, 1, 0)
+    assert pool.acquire(timeout=1).ping()  # fresh connection after the broken one was closed
+
+
+def test_idle_connections_evicted_down_to_min_size():
+    backend = FakeBackend(connect_latency=0.0, query_latency=0.0)
+    pool = ConnectionPool(backend.connect, min_size=1, max_size=3, idle_timeout=0.01)
+    held = [pool.acquire() for _ in range(3)]
+    for connection in held:
+        pool.release(connection)
+    time.sleep(0.05)
+    assert pool.evict_idle() == 2
+    assert pool.stats()["size"] == 1 and backend.open_connections == 1
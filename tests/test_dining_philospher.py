@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from concurrency_patterns.dining_philospher import ChandyMisraTable, ForkOrderingTable, WaiterTable
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("state not reached")
+        time.sleep(0.001)
+
+
+def test_chandy_misra_hands_fork_to_hungry_neighbour_on_put_down():
+    table = ChandyMisraTable(3)
+    table.pick_up(0)
+    hungry = threading.Thread(target=table.pick_up, args=(1,), daemon=True)
+    hungry.start()
+    wait_until(lambda: table.state[1] == table.HUNGRY)
+
+    table.put_down(0)
+    shared = table.forks[0]  # fork between philosopher 0 and 1
+    assert shared.owner == 1
+
+    # 0 is hungry again right away, but can't take back the clean fork 1 is waiting to use.
+    again = threading.Thread(target=table.pick_up, args=(0,), daemon=True)
+    again.start()
+    hungry.join(5)
+    assert table.state[1] == table.EATING
+    time.sleep(0.05)
+    assert table.state[0] == table.HUNGRY
+
+    table.put_down(1)
+    again.join(5)
+    assert table.state[0] == table.EATING
+
+
+@pytest.mark.parametrize("table_cls", [ForkOrderingTable, WaiterTable, ChandyMisraTable])
+def test_neighbours_never_eat_together_and_everyone_finishes(table_cls, run_bounded):
+    n, meals = 5, 200
+    table = table_cls(n)
+    eating = [False] * n
+    violations = []
+    counts = [0] * n
+
+    def philosopher(id):
+        for _ in range(meals):
+            table.pick_up(id)
+            eating[id] = True
+            if eating[(id - 1) % n] or eating[(id + 1) % n]:
+                violations.append(id)
+            time.sleep(0)
+            eating[id] = False
+            counts[id] += 1
+            table.put_down(id)
+
+    def dine():
+        threads = [threading.Thread(target=philosopher, args=(id,)) for id in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    run_bounded(dine, timeout=30)
+    assert violations == []
+    assert counts == [meals] * n
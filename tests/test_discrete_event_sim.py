@@ -0,0 +1,27 @@
+import pytest
+
+from concurrency_patterns.barber_pool import ShedPolicy
+from concurrency_patterns.discrete_event_sim import simulate_barber_pool, simulate_crawl
+
+
+def test_same_seed_same_run():
+    assert simulate_barber_pool(duration=30, seed=7) == simulate_barber_pool(duration=30, seed=7)
+
+
+@pytest.mark.parametrize("policy", list(ShedPolicy))
+def test_barber_pool_policies_run_on_virtual_clock(policy):
+    result = simulate_barber_pool(num_barbers=4, waiting_chairs=32, arrival_rate=600, policy=policy,
+                                  deadline=0.05, duration=30, seed=1)
+    assert result["arrived"] == sum(result[o] for o in ("served", "rejected", "dropped", "expired"))
+    assert result["rejection_rate"] > 0  # overloaded: capacity ~400/s
+    if policy is ShedPolicy.DEADLINE_AWARE:
+        assert result["queue_wait"]["max_ms"] <= 50  # nobody starts after the deadline
+    if policy is ShedPolicy.DROP_OLDEST:
+        assert result["dropped"] > 0 and result["rejected"] == 0
+    if policy is ShedPolicy.REJECT_NEW:
+        assert result["dropped"] == result["expired"] == 0
+
+
+def test_crawl_terminates_after_every_page():
+    graph = {i: [(i * 7 + j) % 200 for j in range(3)] for i in range(200)}
+    assert simulate_crawl(graph, 0, num_workers=4)["pages"] == 200
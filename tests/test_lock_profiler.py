@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from concurrency_patterns.lock_profiler import LockProfiler
+from concurrency_patterns.multithreaded_webcrawler_v2 import HtmlParser, crawl
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("state not reached")
+        time.sleep(0.001)
+
+
+def row(profiler, name):
+    return next(r for r in profiler.report() if r["name"] == name)
+
+
+def handshake_rounds(lock, condition, enter, rounds=5):
+    """
+    Consumer waits once per round for a flag set + notified while it is waiting.
+    enter: the object the consumer uses in its with block (the lock or the condition).
+    """
+    state = {"flag": False, "round": 0}
+
+    def consumer():
+        for _ in range(rounds):
+            with enter:
+                while not state["flag"]:
+                    condition.wait()
+                state["flag"] = False
+                state["round"] += 1
+
+    thread = threading.Thread(target=consumer, daemon=True)
+    thread.start()
+    for i in range(rounds):
+        wait_until(lambda: len(condition._waiters) == 1 and state["round"] == i)
+        with lock:
+            state["flag"] = True
+            condition.notify()
+    thread.join(5)
+
+
+@pytest.mark.parametrize("enter_through", ["lock", "condition"])
+def test_notified_waits_are_not_spurious(enter_through):
+    profiler = LockProfiler(sample_rate=1)
+    lock = profiler.lock("probe.lock")
+    condition = profiler.condition(lock, "probe.cond")
+    handshake_rounds(lock, condition, lock if enter_through == "lock" else condition)
+    stats = row(profiler, "probe.cond")
+    assert stats["waits"] == 5
+    assert stats["spurious_wakeups"] == 0
+
+
+def test_rewait_without_releasing_lock_is_spurious():
+    profiler = LockProfiler(sample_rate=1)
+    lock = profiler.lock("probe.lock")
+    condition = profiler.condition(lock, "probe.cond")
+    state = {"value": 0}
+
+    def consumer():
+        with lock:
+            while state["value"] < 2:
+                condition.wait()
+
+    thread = threading.Thread(target=consumer, daemon=True)
+    thread.start()
+    for value in (1, 2):
+        wait_until(lambda: len(condition._waiters) == 1)
+        with lock:
+            state["value"] = value
+            condition.notify()
+    thread.join(5)
+    stats = row(profiler, "probe.cond")
+    assert (stats["waits"], stats["spurious_wakeups"]) == (2, 1)
+
+
+def test_profiled_crawl_reports_few_spurious_wakeups(capsys):
+    graph = {f"http://site.com/{i}": [f"/{(i * 7 + k) % 300}" for k in range(1, 4)] for i in range(300)}
+    profiler = LockProfiler(sample_rate=1)
+    crawl("http://site.com/0", HtmlParser(graph, latency=0.001), num_threads=4, profiler=profiler)
+    stats = row(profiler, "WebCrawler.url_available")
+    # notify_all wakes every idle worker for a batch of urls, some re-wait; never nearly all.
+    assert stats["spurious_wakeups"] < stats["waits"] / 2 or stats["waits"] < 4
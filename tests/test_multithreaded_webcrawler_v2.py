@@ -0,0 +1,50 @@
+import threading
+import time
+
+from concurrency_patterns.multithreaded_webcrawler_v2 import HtmlParser, WebCrawler, crawl
+
+GRAPH = {
+    "http://site.com/": ["/a", "/b", "http://other.com/x"],
+    "http://site.com/a": ["/b", "/c", "/"],
+    "http://site.com/b": ["/a", "/c"],
+    "http://site.com/c": ["/d", "/a"],
+    "http://site.com/d": [],
+}
+SAME_HOST = {"http://site.com/", "http://site.com/a", "http://site.com/b", "http://site.com/c", "http://site.com/d"}
+
+
+class FailingParser(HtmlParser):
+    def getUrls(self, url):
+        if url.endswith("/b"):
+            raise RuntimeError("fetch failed")
+        return super().getUrls(url)
+
+
+def test_crawl_visits_every_same_host_url_once_and_exits_without_idle_wait(run_bounded, capsys):
+    start = time.monotonic()
+    urls = run_bounded(crawl, "http://site.com", HtmlParser(GRAPH), 4)
+    assert sorted(urls) == sorted(SAME_HOST)
+    assert time.monotonic() - start < 2  # v1 idled 3s on an empty frontier before exiting
+
+
+def test_pending_work_reaches_zero_when_get_urls_raises(run_bounded, capsys):
+    crawler = WebCrawler(FailingParser(GRAPH))
+    crawler.set_start_url("http://site.com")
+    workers = [threading.Thread(target=crawler.crawl) for _ in range(3)]
+
+    def run_workers():
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    run_bounded(run_workers)
+    assert crawler.pending_work == 0
+    assert not crawler.urls_to_visit
+    assert set(crawler.crawled_urls) == SAME_HOST  # /c and /d still reached through /a
+
+
+def test_concurrent_workers_terminate_together(run_bounded, capsys):
+    graph = {f"http://site.com/{i}": [f"/{(i * 7 + k) % 500}" for k in range(1, 4)] for i in range(500)}
+    urls = run_bounded(crawl, "http://site.com/0", HtmlParser(graph), 8)
+    assert len(urls) == len(set(urls)) == 500
@@ -0,0 +1,39 @@
+import pytest
+
+from concurrency_patterns.phase_engine import PhaseEngine, PhaseError, failing_phase, stop_after_two
+
+
+def noop_phase(worker_id, num_workers, cancelled):
+    pass
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_raising_phase_aborts_barrier_and_is_reported(backend, run_bounded):
+    engine = PhaseEngine([noop_phase, failing_phase, noop_phase], num_workers=4, backend=backend)
+    with pytest.raises(PhaseError) as info:
+        run_bounded(engine.run, timeout=30)
+    assert (info.value.worker_id, info.value.phase_index) == (1, 1)
+    assert isinstance(info.value.__cause__, ValueError)
+    assert not any(worker.is_alive() for worker in engine.workers)
+
+
+def test_raising_phase_with_timeout_is_not_reported_as_cancel(run_bounded):
+    engine = PhaseEngine([failing_phase], num_workers=3)
+    with pytest.raises(PhaseError):
+        run_bounded(engine.run, 5, timeout=10)
+
+
+def test_raising_should_stop_is_reported(run_bounded):
+    def should_stop(phases_completed):
+        raise KeyError("broken decision")
+
+    engine = PhaseEngine([noop_phase] * 3, num_workers=3, should_stop=should_stop)
+    with pytest.raises(PhaseError) as info:
+        run_bounded(engine.run, timeout=10)
+    assert isinstance(info.value.__cause__, KeyError)
+
+
+def test_should_stop_in_barrier_action_stops_every_worker(run_bounded):
+    engine = PhaseEngine([noop_phase] * 5, num_workers=4, should_stop=stop_after_two)
+    summary = run_bounded(engine.run, timeout=10)
+    assert summary["phases_completed"] == 2 and summary["cancelled"]
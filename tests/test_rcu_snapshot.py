@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+from concurrency_patterns.rcu_snapshot import RCUSnapshot
+
+
+class FlakyKey:
+    """
+    Hashable when update() checks it, raises once the combiner applies it.
+    """
+    def __init__(self):
+        self.calls = 0
+
+    def __hash__(self):
+        self.calls += 1
+        if self.calls > 1:
+            raise RuntimeError("hash failed")
+        return 1
+
+
+def test_unhashable_delete_is_rejected_before_enqueue():
+    table = RCUSnapshot({"a": 1})
+    with pytest.raises(TypeError):
+        table.update(deletes=[["a"]])
+    assert table.pending == []
+    assert table.update({"b": 2}) == 1
+    assert dict(table.read().data) == {"a": 1, "b": 2}
+
+
+def test_failing_request_does_not_lose_rest_of_batch():
+    table = RCUSnapshot({"a": 1})
+    results = {}
+
+    def writer(name, **kwargs):
+        try:
+            results[name] = table.update(**kwargs)
+        except Exception as e:
+            results[name] = e
+
+    # Hold write_lock so all three requests are drained by one combiner.
+    table.write_lock.acquire()
+    threads = [
+        threading.Thread(target=writer, args=("first",), kwargs={"changes": {"b": 2}}),
+        threading.Thread(target=writer, args=("bad",), kwargs={"changes": {"c": 3}, "deletes": [FlakyKey()]}),
+        threading.Thread(target=writer, args=("last",), kwargs={"deletes": ["a"]}),
+    ]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while len(table.pending) < 3 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert len(table.pending) == 3
+    table.write_lock.release()
+    for t in threads:
+        t.join(5)
+
+    assert isinstance(results["bad"], RuntimeError)
+    assert results["first"] == results["last"] == 1
+    assert dict(table.read().data) == {"b": 2}  # "c" of the failed request rolled back
+    assert table.updates == 2 and table.publishes == 1
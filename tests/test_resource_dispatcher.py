@@ -0,0 +1,101 @@
+import random
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from concurrency_patterns.resource_dispatcher import ResourceDispatcher
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("state not reached")
+        time.sleep(0.001)
+
+
+def start_acquire(consumer, results, timeout=5):
+    thread = threading.Thread(target=lambda: results.append((consumer.name, consumer.acquire(timeout))), daemon=True)
+    thread.start()
+    return thread
+
+
+def test_complete_set_is_handed_to_waiter_before_later_arrivals():
+    dispatcher = ResourceDispatcher({"a": 1, "b": 1})
+    results = []
+    waiter = start_acquire(dispatcher.register("ab", {"a": 1, "b": 1}), results)
+    wait_until(lambda: len(dispatcher.waiters) == 1)
+
+    dispatcher.put_many({"a": 1, "b": 1})
+    # Tokens were deducted on the waiter's behalf inside put_many: nothing left to barge on.
+    assert dispatcher.available["a"] == dispatcher.available["b"] == 0
+    assert not dispatcher.register("late", {"a": 1}).acquire(timeout=0.05)
+
+    waiter.join(5)
+    assert results == [("ab", True)]
+    assert dispatcher.stats["consumer_wakeups"] == 1
+
+
+def test_put_wakes_only_waiter_it_can_serve():
+    dispatcher = ResourceDispatcher({"x": 1, "y": 1})
+    results = []
+    threads = [start_acquire(dispatcher.register("needs-x", {"x": 1}), results),
+               start_acquire(dispatcher.register("needs-y", {"y": 1}), results)]
+    wait_until(lambda: len(dispatcher.waiters) == 2)
+
+    dispatcher.put("y")
+    threads[1].join(5)
+    assert results == [("needs-y", True)]
+    assert [waiter.requirements for waiter in dispatcher.waiters] == [{"x": 1}]
+
+    dispatcher.put("x")
+    threads[0].join(5)
+    assert dispatcher.stats["grants"] == dispatcher.stats["consumer_wakeups"] == 2
+
+
+def test_incomplete_waiter_does_not_block_smaller_one():
+    dispatcher = ResourceDispatcher({"a": 2, "b": 1})
+    results = []
+    big = start_acquire(dispatcher.register("big", {"a": 1, "b": 1}), results)
+    wait_until(lambda: len(dispatcher.waiters) == 1)
+    dispatcher.put("a")
+    assert dispatcher.register("small", {"a": 1}).acquire(timeout=1)
+    dispatcher.put_many({"a": 1, "b": 1})
+    big.join(5)
+    assert results == [("big", True)]
+
+
+def test_producer_blocks_at_capacity():
+    dispatcher = ResourceDispatcher({"slot": 1})
+    assert dispatcher.put("slot")
+    assert not dispatcher.put("slot", timeout=0.05)
+    assert dispatcher.stats["producer_waits"] == 1
+    assert dispatcher.register("c", {"slot": 1}).acquire(timeout=1)
+    assert dispatcher.put("slot", timeout=1)
+
+
+def test_smokers_with_atomic_pairs_all_finish(run_bounded):
+    ingredients = ["tobacco", "paper", "matches"]
+    table = ResourceDispatcher({ingredient: 1 for ingredient in ingredients})
+    smoked = Counter()
+    rounds = 300
+
+    def smoker(own):
+        consumer = table.register(own, {ingredient: 1 for ingredient in ingredients if ingredient != own})
+        while consumer.acquire(timeout=0.5):
+            smoked[own] += 1
+
+    def session():
+        smokers = [threading.Thread(target=smoker, args=(own,)) for own in ingredients]
+        for t in smokers:
+            t.start()
+        rng = random.Random(0)
+        for _ in range(rounds):
+            table.put_many({ingredient: 1 for ingredient in rng.sample(ingredients, 2)})
+        for t in smokers:
+            t.join()
+
+    run_bounded(session, timeout=30)
+    assert sum(smoked.values()) == rounds
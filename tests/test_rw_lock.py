@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+from concurrency_patterns.rw_lock import RWLock, RWLockPolicy
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("state not reached")
+        time.sleep(0.001)
+
+
+def start(fn):
+    thread = threading.Thread(target=fn, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_phase_fair_reader_blocked_by_writer_enters_before_next_writer():
+    lock = RWLock(RWLockPolicy.PHASE_FAIR)
+    order = []
+    reader_release = threading.Event()
+    lock.acquire_write()
+
+    def reader():
+        lock.acquire_read()
+        order.append("reader")
+        reader_release.wait()
+        lock.release_read()
+
+    def second_writer():
+        lock.acquire_write()
+        order.append("writer")
+        lock.release_write()
+
+    threads = [start(reader)]
+    wait_until(lambda: lock.blocked_readers == 1)
+    threads.append(start(second_writer))
+    wait_until(lambda: lock.waiting_writers == 1)
+
+    lock.release_write()  # end of write phase: the blocked reader goes first
+    wait_until(lambda: order == ["reader"])
+    time.sleep(0.05)
+    assert order == ["reader"]  # next writer waits for the admitted batch to leave
+
+    reader_release.set()
+    for thread in threads:
+        thread.join(5)
+    assert order == ["reader", "writer"]
+
+
+def test_phase_fair_new_reader_does_not_overtake_waiting_writer():
+    lock = RWLock(RWLockPolicy.PHASE_FAIR)
+    order = []
+    lock.acquire_read()
+
+    def writer():
+        lock.acquire_write()
+        order.append("writer")
+        lock.release_write()
+
+    def late_reader():
+        lock.acquire_read()
+        order.append("reader")
+        lock.release_read()
+
+    threads = [start(writer)]
+    wait_until(lambda: lock.waiting_writers == 1)
+    threads.append(start(late_reader))
+    wait_until(lambda: lock.blocked_readers == 1)
+
+    lock.release_read()
+    for thread in threads:
+        thread.join(5)
+    assert order == ["writer", "reader"]
+
+
+def test_phase_fair_writer_timeout_admits_readers_blocked_behind_it():
+    lock = RWLock(RWLockPolicy.PHASE_FAIR)
+    lock.acquire_read()
+    acquired = []
+
+    def writer():
+        acquired.append(lock.acquire_write(timeout=0.1))
+
+    def reader():
+        acquired.append(lock.acquire_read(timeout=5))
+        lock.release_read()
+
+    writer_thread = start(writer)
+    wait_until(lambda: lock.waiting_writers == 1)
+    reader_thread = start(reader)
+    writer_thread.join(5)
+    reader_thread.join(5)
+    assert acquired == [False, True]
+    lock.release_read()
+    assert lock.acquire_write(timeout=1)
+
+
+def test_release_write_by_other_thread_raises():
+    lock = RWLock()
+    lock.acquire_write()
+    errors = []
+
+    def release():
+        try:
+            lock.release_write()
+        except RuntimeError as e:
+            errors.append(e)
+
+    start(release).join(5)
+    assert len(errors) == 1
+    lock.release_write()
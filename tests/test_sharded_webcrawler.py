@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from concurrency_patterns.multithreaded_webcrawler_v2 import HtmlParser
+from concurrency_patterns.sharded_webcrawler import sharded_crawl
+
+HOSTS = [f"host{h}.com" for h in range(4)]
+GRAPH = {
+    f"http://{host}/{i}": [f"http://{host}/{i + 1}", f"http://{HOSTS[(h + 1) % len(HOSTS)]}/{i}"]
+    for h, host in enumerate(HOSTS)
+    for i in range(10)
+}
+
+
+class DyingParser(HtmlParser):
+    """
+    Kills the shard process that fetches /5 of host2 (like an OOM kill, nothing to catch).
+    """
+    def getUrls(self, url):
+        if url == "http://host2.com/5":
+            os._exit(3)
+        return super().getUrls(url)
+
+
+def test_sharded_crawl_merges_every_shard(run_bounded):
+    urls = run_bounded(sharded_crawl, "http://host0.com/0", HtmlParser(GRAPH), 3, timeout=30)
+    expected = set(GRAPH) | {f"http://{host}/10" for host in HOSTS}
+    assert len(urls) == len(expected) and set(urls) == expected
+
+
+def test_dead_shard_raises_instead_of_hanging(run_bounded, capsys):
+    def crawl():
+        return sharded_crawl("http://host0.com/0", DyingParser(GRAPH), num_shards=3, poll_interval=0.1)
+
+    with pytest.raises(RuntimeError, match="exited with code 3"):
+        run_bounded(crawl, timeout=30)
@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+
+from concurrency_patterns.lock_profiler import LockProfiler
+from concurrency_patterns.work_stealing_executor import WorkStealingExecutor, fan_out
+
+
+class RecordingExecutor(WorkStealingExecutor):
+    def __init__(self, *args, **kwargs):
+        self.sleepers_at_rescan = []
+        super().__init__(*args, **kwargs)
+
+    def _has_work(self):
+        # Called with the lock held, right before a worker waits.
+        self.sleepers_at_rescan.append(self.sleepers)
+        return super()._has_work()
+
+
+def test_worker_counts_itself_as_sleeper_before_rescan():
+    executor = RecordingExecutor(2)
+    executor.submit(abs, -1).result(timeout=5)
+    assert executor.wait_all(timeout=5)
+    executor.shutdown()
+    assert executor.sleepers_at_rescan and min(executor.sleepers_at_rescan) >= 1
+
+
+def test_subtask_of_blocked_task_is_stolen_by_sleeping_worker():
+    executor = WorkStealingExecutor(2, seed=0)
+    release = threading.Event()
+    child_ran = threading.Event()
+
+    def parent():
+        executor.submit(child_ran.set)  # lands on this worker's own deque
+        release.wait(5)  # owner busy: only a steal can run the child
+
+    executor.submit(parent)
+    assert child_ran.wait(5)
+    release.set()
+    assert executor.wait_all(timeout=5)
+    assert executor.stats()["stolen"] >= 1
+    executor.shutdown()
+
+
+def test_gather_fork_join_does_not_deadlock(run_bounded):
+    executor = WorkStealingExecutor(2)
+
+    def parallel_sum(lo, hi):
+        if hi - lo <= 100:
+            return sum(range(lo, hi))
+        mid = (lo + hi) // 2
+        return sum(executor.gather([executor.submit(parallel_sum, lo, mid), executor.submit(parallel_sum, mid, hi)]))
+
+    assert run_bounded(lambda: executor.submit(parallel_sum, 0, 20_000).result()) == sum(range(20_000))
+    executor.shutdown()
+
+
+def test_wait_all_covers_fan_out_and_exceptions_reach_futures():
+    with WorkStealingExecutor(4) as executor:
+        assert len(fan_out(executor, depth=4, branching=4)) == 341
+        assert executor.wait_all(timeout=5)
+        with pytest.raises(ZeroDivisionError):
+            executor.submit(lambda: 1 / 0).result(timeout=5)
+    with pytest.raises(RuntimeError):
+        executor.submit(abs, 1)
+
+
+def test_profiled_executor_wakeups_are_not_all_spurious():
+    profiler = LockProfiler(sample_rate=1)
+    with WorkStealingExecutor(4, profiler=profiler) as executor:
+        for _ in range(20):
+            executor.submit(abs, -1).result(timeout=5)
+            assert executor.wait_all(timeout=5)
+    row = next(r for r in profiler.report() if r["name"] == "WorkStealingExecutor.work_available")
+    assert row["waits"] > 0
+    assert row["spurious_wakeups"] < row["waits"]